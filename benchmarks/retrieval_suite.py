@@ -0,0 +1,238 @@
+import argparse
+import importlib.util
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import get_embeddings
+from src.rag.lore_build import build_lore_artifact
+from src.rag.lore_data import get_all_lore_documents
+from src.rag.retriever import RetrievalSpec
+from src.rag.vector_store import LoreVectorStore
+from src.world_data import get_world_data
+
+
+GENERIC_WORDS = {
+    "the", "of", "and", "its", "uses", "seat", "power", "haven", "days",
+    "keeper", "trader", "cruel", "town", "square", "camp", "potion", "sword",
+    "armor", "stolen", "rusty", "leather", "mysterious", "health", "mana"
+}
+
+MODES = ["dense", "hybrid", "keyword"]
+
+
+def words(text: str) -> set:
+    return {word.split("'")[0] for word in re.findall(r"[a-z]+(?:'[a-z]+)?", text.lower())}
+
+
+def distinctive(key: str, name: str) -> set:
+    return {word for word in words(key.replace("_", " ")) | words(name) if len(word) >= 4 and word not in GENERIC_WORDS}
+
+
+def relevant_documents(documents, tokens: set, filter_tags=None) -> set:
+    relevant = set()
+    for doc in documents:
+        doc_tags = set(doc["metadata"]["tags"])
+        if filter_tags and not doc_tags & set(filter_tags):
+            continue
+        if tokens & (doc_tags | words(doc["metadata"]["title"])):
+            relevant.add(doc["id"])
+    return relevant
+
+
+def generate_queries(documents):
+    world = get_world_data()
+    
+    queries = []
+    
+    def add(kind, spec, tokens):
+        relevant = relevant_documents(documents, tokens, spec.tags)
+        if relevant:
+            queries.append({"kind": kind, "query": spec.query, "tags": spec.tags, "relevant": relevant})
+    
+    for key, location in world.locations.items():
+        tokens = distinctive(key, location["name"])
+        add("location", RetrievalSpec.location(key), tokens)
+        for action in location.get("available_actions", []):
+            add("action", RetrievalSpec.action(action, key), tokens)
+    
+    for key, npc in world.npcs.items():
+        add("npc", RetrievalSpec.npc(npc["name"]), distinctive(key, npc["name"]))
+    
+    for key, item in world.items.items():
+        add("item", RetrievalSpec.item(item["name"]), distinctive(key, item["name"]))
+    
+    for doc in documents:
+        queries.append({
+            "kind": "title",
+            "query": f"What do you know about {doc['metadata']['title'].lower()}?",
+            "tags": None,
+            "relevant": {doc["id"]}
+        })
+    
+    return queries
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+def directory_bytes(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def score(queries, results, k):
+    recalls, reciprocal_ranks = [], []
+    for query, result in zip(queries, results):
+        ids = [item["id"] for item in result[:k]]
+        hits = [doc_id for doc_id in ids if doc_id in query["relevant"]]
+        recalls.append(len(hits) / min(len(query["relevant"]), k))
+        first = next((rank for rank, doc_id in enumerate(ids, 1) if doc_id in query["relevant"]), None)
+        reciprocal_ranks.append(1.0 / first if first else 0.0)
+    return sum(recalls) / len(recalls), sum(reciprocal_ranks) / len(reciprocal_ranks)
+
+
+def distance_sweep(queries, results, cutoffs):
+    relevant, irrelevant = [], []
+    for query, result in zip(queries, results):
+        for item in result:
+            if item.get("distance") is not None:
+                (relevant if item["id"] in query["relevant"] else irrelevant).append(item["distance"])
+    
+    return [
+        {
+            "max_distance": cutoff,
+            "relevant_kept": round(sum(d <= cutoff for d in relevant) / len(relevant), 3) if relevant else None,
+            "irrelevant_dropped": round(sum(d > cutoff for d in irrelevant) / len(irrelevant), 3) if irrelevant else None
+        }
+        for cutoff in cutoffs
+    ]
+
+
+def run_config(backend, quantization, mode, artifact, embeddings, queries, k, repeat, batch_size, workdir, cutoffs):
+    directory = Path(workdir) / f"{backend}_{quantization}_{mode}"
+    store = LoreVectorStore(
+        persist_directory=str(directory),
+        backend=backend,
+        retrieval_mode=mode,
+        quantization=quantization,
+        embeddings=embeddings
+    )
+    
+    start = time.perf_counter()
+    store.initialize_lore(verbose=False, artifact=artifact)
+    build_ms = (time.perf_counter() - start) * 1000
+    
+    if backend == "numpy":
+        index_bytes = store.backend.memory_usage()["search_matrix"]
+    else:
+        index_bytes = directory_bytes(directory)
+    
+    latencies, first_pass = [], None
+    for _ in range(repeat):
+        results = []
+        for query in queries:
+            start = time.perf_counter()
+            results.append(store.search(query["query"], n_results=k, filter_tags=query["tags"]))
+            latencies.append((time.perf_counter() - start) * 1000)
+        first_pass = first_pass or results
+    
+    start = time.perf_counter()
+    for i in range(0, len(queries), batch_size):
+        batch = queries[i:i + batch_size]
+        store.search_batch([q["query"] for q in batch], [k] * len(batch), [q["tags"] for q in batch])
+    batch_seconds = time.perf_counter() - start
+    
+    recall, mrr = score(queries, first_pass, k)
+    return {
+        "backend": backend if backend != "numpy" else f"numpy/{quantization}",
+        "mode": mode,
+        "build_ms": round(build_ms, 1),
+        "index_mb": round(index_bytes / 1e6, 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "qps": round(len(latencies) / (sum(latencies) / 1000), 1),
+        "batch_qps": round(len(queries) / batch_seconds, 1),
+        "recall_at_k": round(recall, 3),
+        "mrr": round(mrr, 3),
+        "query_cache": store.query_cache.stats()["hit_rate"],
+        "distance_sweep": distance_sweep(queries, first_pass, cutoffs)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lore retrieval speed and quality")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query set (first pass is cold)")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--backends", default="numpy,chroma")
+    parser.add_argument("--quantization", default="none,float16,int8")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--max-distances", default="0.5,0.6,0.7,0.8,0.9,1.0",
+                        help="CONTEXT_MAX_DISTANCE cutoffs to evaluate on dense results")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+    
+    documents = get_all_lore_documents()
+    queries = generate_queries(documents)
+    kinds = {}
+    for query in queries:
+        kinds[query["kind"]] = kinds.get(query["kind"], 0) + 1
+    print(f"{len(queries)} queries over {len(documents)} lore documents: "
+          + ", ".join(f"{count} {kind}" for kind, count in sorted(kinds.items())))
+    
+    embeddings = get_embeddings()
+    
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        artifact = build_lore_artifact(embeddings, path=Path(tmp) / "lore_embeddings.json", verbose=False)
+        print(f"Embedded lore artifact in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+        
+        configs = []
+        for backend in args.backends.split(","):
+            if backend == "chroma" and importlib.util.find_spec("chromadb") is None:
+                print("chromadb is not installed, skipping the chroma backend")
+                continue
+            for quantization in (args.quantization.split(",") if backend == "numpy" else ["none"]):
+                for mode in args.modes.split(","):
+                    configs.append((backend, quantization, mode))
+        
+        header = (f"{'backend':<15} {'mode':<8} {'build ms':>9} {'index MB':>9} {'p50 ms':>8} {'p99 ms':>8} "
+                  f"{'qps':>8} {'batch qps':>10} {'recall@k':>9} {'mrr':>6}")
+        print(header)
+        for backend, quantization, mode in configs:
+            row = run_config(
+                backend, quantization, mode, artifact, embeddings, queries,
+                args.k, args.repeat, args.batch_size, tmp,
+                [float(value) for value in args.max_distances.split(",")]
+            )
+            rows.append(row)
+            print(f"{row['backend']:<15} {row['mode']:<8} {row['build_ms']:>9.1f} {row['index_mb']:>9.3f} "
+                  f"{row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['qps']:>8.1f} {row['batch_qps']:>10.1f} "
+                  f"{row['recall_at_k']:>9.3f} {row['mrr']:>6.3f}")
+        
+        print(f"\n{'backend':<15} {'mode':<8} {'max dist':>9} {'relevant kept':>14} {'irrelevant dropped':>19}")
+        for row in rows:
+            if row["mode"] != "dense":
+                continue
+            for sweep in row["distance_sweep"]:
+                if sweep["relevant_kept"] is None or sweep["irrelevant_dropped"] is None:
+                    continue
+                print(f"{row['backend']:<15} {row['mode']:<8} {sweep['max_distance']:>9.2f} "
+                      f"{sweep['relevant_kept']:>14.3f} {sweep['irrelevant_dropped']:>19.3f}")
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"k": args.k, "queries": len(queries), "results": rows}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
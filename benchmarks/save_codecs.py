@@ -0,0 +1,108 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.game_state import create_initial_state
+from src.persistence.codecs import (
+    COMPRESSORS,
+    SERIALIZERS,
+    CompactCodec,
+    JsonCodec,
+    decode_state
+)
+
+
+WORDS = (
+    "the tavern keeper leans closer and whispers about bandits in the dark forest "
+    "while the guard captain watches the road and the merchant counts his coins"
+).split()
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+
+
+def make_state(turns: int, seed: int):
+    rng = random.Random(seed)
+    state = create_initial_state("Benchmark")
+    
+    state["conversation_history"] = [
+        {"speaker": rng.choice(["Benchmark", "Marta the Tavern Keeper", "Captain Borin"]), "message": sentence(rng, 30)}
+        for _ in range(turns)
+    ]
+    state["world_events"] = [
+        {"turn": i, "event": sentence(rng, 12), "location": rng.choice(["tavern", "dark_forest", "castle"])}
+        for i in range(turns // 2)
+    ]
+    state["quest_log"] = [
+        {
+            "id": f"quest_{i}",
+            "name": sentence(rng, 3),
+            "description": sentence(rng, 25),
+            "objectives": [sentence(rng, 8) for _ in range(3)],
+            "objectives_completed": [],
+            "status": "started",
+            "rewards": {"gold": rng.randint(10, 200), "experience": rng.randint(10, 300)}
+        }
+        for i in range(turns // 20 + 1)
+    ]
+    state["game_flags"] = {f"flag_{i}": rng.random() < 0.5 for i in range(turns)}
+    state["npc_relationships"] = {f"npc_{i}": rng.randint(-100, 100) for i in range(turns // 10 + 1)}
+    state["turn_count"] = turns
+    return state
+
+
+def available_codecs():
+    codecs = [("json (indent=2)", JsonCodec()), ("json (minified)", JsonCodec(indent=None))]
+    for serializer in SERIALIZERS:
+        for compressor in COMPRESSORS:
+            try:
+                codecs.append((f"{serializer}+{compressor}", CompactCodec(serializer, compressor)))
+            except ImportError as e:
+                print(f"Skipping {serializer}+{compressor}: {e}")
+    return codecs
+
+
+def measure(codec, state, repeat: int):
+    encode_ms, decode_ms = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = codec.encode(state)
+        encode_ms.append((time.perf_counter() - start) * 1000)
+        
+        start = time.perf_counter()
+        decoded = decode_state(data)
+        decode_ms.append((time.perf_counter() - start) * 1000)
+    
+    if decoded != state:
+        raise AssertionError("Round trip changed the state")
+    return len(data), min(encode_ms), min(decode_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare save codecs by size and encode/decode time")
+    parser.add_argument("--turns", default="100,1000,10000", help="Comma-separated history lengths to test")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    codecs = available_codecs()
+    
+    for turns in [int(value) for value in args.turns.split(",")]:
+        state = make_state(turns, args.seed)
+        baseline = None
+        
+        print(f"\n{turns} turns of history")
+        print(f"{'codec':<18} {'bytes':>12} {'ratio':>7} {'encode ms':>10} {'decode ms':>10}")
+        for label, codec in codecs:
+            size, encode_ms, decode_ms = measure(codec, state, args.repeat)
+            baseline = baseline or size
+            print(f"{label:<18} {size:>12,} {size / baseline:>7.2f} {encode_ms:>10.2f} {decode_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.rag.backends import ChromaBackend, NumpyBackend
+
+
+TAGS = ["location", "npc", "item", "history", "world_lore", "danger", "forest", "castle"]
+
+
+def make_corpus(size: int, dim: int, seed: int):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(size, dim)).astype(np.float32)
+    ids = [f"doc_{i}" for i in range(size)]
+    documents = [f"Synthetic lore document {i}" for i in range(size)]
+    metadatas = [
+        {"tags": str(rng.choice(TAGS)), "category": f"category_{i % 4}"}
+        for i in range(size)
+    ]
+    return ids, embeddings, documents, metadatas
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+def run_queries(backend, queries, n_results, filter_tags):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        backend.query([query.tolist()], n_results, filter_tags)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def build(backend, ids, embeddings, documents, metadatas, batch_size=5000):
+    start = time.perf_counter()
+    for i in range(0, len(ids), batch_size):
+        backend.upsert(
+            ids[i:i + batch_size],
+            embeddings[i:i + batch_size].tolist(),
+            documents[i:i + batch_size],
+            metadatas[i:i + batch_size]
+        )
+    backend.persist()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Chroma and NumPy vector backends")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    ids, embeddings, documents, metadatas = make_corpus(args.size, args.dim, args.seed)
+    queries = np.random.default_rng(args.seed + 1).normal(size=(args.queries, args.dim)).astype(np.float32)
+    
+    print(f"Corpus: {args.size} x {args.dim}, {args.queries} queries, k={args.k}\n")
+    print(f"{'backend':<8} {'filter':<10} {'build ms':>10} {'p50 ms':>9} {'p99 ms':>9} {'qps':>9}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [
+            ChromaBackend(str(Path(tmp) / "chroma")),
+            NumpyBackend(str(Path(tmp) / "numpy"))
+        ]
+        
+        for backend in backends:
+            build_ms = build(backend, ids, embeddings, documents, metadatas)
+            
+            for filter_tags in (None, ["npc"]):
+                latencies = run_queries(backend, queries, args.k, filter_tags)
+                qps = len(latencies) / (sum(latencies) / 1000)
+                print(f"{backend.name:<8} {str(filter_tags and filter_tags[0]):<10} {build_ms:>10.1f} "
+                      f"{percentile(latencies, 50):>9.2f} {percentile(latencies, 99):>9.2f} {qps:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
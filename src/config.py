@@ -14,14 +14,90 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama2")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+LOCAL_STUB_MODEL = os.getenv("LOCAL_STUB_MODEL", "local-stub")
+LOCAL_STUB_SEED = int(os.getenv("LOCAL_STUB_SEED", "0"))
+LOCAL_STUB_LATENCY_MS = float(os.getenv("LOCAL_STUB_LATENCY_MS", "250"))
+LOCAL_STUB_TOKENS_PER_SECOND = float(os.getenv("LOCAL_STUB_TOKENS_PER_SECOND", "40"))
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10"))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
 
 STARTING_HEALTH = int(os.getenv("STARTING_HEALTH", "100"))
 STARTING_GOLD = int(os.getenv("STARTING_GOLD", "50"))
 MAX_INVENTORY_SIZE = int(os.getenv("MAX_INVENTORY_SIZE", "20"))
 SAVE_DIRECTORY = PROJECT_ROOT / os.getenv("SAVE_DIRECTORY", "saves")
+SAVE_FORMAT = os.getenv("SAVE_FORMAT", "json")
+SAVES_PER_PAGE = int(os.getenv("SAVES_PER_PAGE", "10"))
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+CHECKPOINT_DB_PATH = PROJECT_ROOT / os.getenv("CHECKPOINT_DB_PATH", "autosave/checkpoints.sqlite")
+CHECKPOINT_KEEP = int(os.getenv("CHECKPOINT_KEEP", "3"))
+CHECKPOINT_MAX_SESSIONS = int(os.getenv("CHECKPOINT_MAX_SESSIONS", "20"))
+CHECKPOINT_PRUNE_EVERY = int(os.getenv("CHECKPOINT_PRUNE_EVERY", "25"))
+JOURNAL_ENABLED = os.getenv("JOURNAL_ENABLED", "true").lower() == "true"
+JOURNAL_DIRECTORY = PROJECT_ROOT / os.getenv("JOURNAL_DIRECTORY", "autosave/journal")
+JOURNAL_SNAPSHOT_EVERY = int(os.getenv("JOURNAL_SNAPSHOT_EVERY", "50"))
+JOURNAL_FSYNC = os.getenv("JOURNAL_FSYNC", "true").lower() == "true"
+JOURNAL_MAX_SESSIONS = int(os.getenv("JOURNAL_MAX_SESSIONS", "20"))
+WORLD_DATA_HOT_RELOAD = os.getenv("WORLD_DATA_HOT_RELOAD", "false").lower() == "true"
+WORLD_DATA_RELOAD_INTERVAL = float(os.getenv("WORLD_DATA_RELOAD_INTERVAL", "1.0"))
 
 VECTOR_STORE_PATH = PROJECT_ROOT / os.getenv("VECTOR_STORE_PATH", "data/vector_store")
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+NUMPY_INDEX_PATH = PROJECT_ROOT / os.getenv("NUMPY_INDEX_PATH", "data/numpy_index")
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none")
+VECTOR_RESCORE_FACTOR = int(os.getenv("VECTOR_RESCORE_FACTOR", "4"))
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+LORE_ARTIFACT_PATH = PROJECT_ROOT / os.getenv("LORE_ARTIFACT_PATH", "data/lore_index/lore_embeddings.json")
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "512"))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+INGEST_CHUNK_CHARS = int(os.getenv("INGEST_CHUNK_CHARS", "1200"))
+INGEST_CHUNK_OVERLAP = int(os.getenv("INGEST_CHUNK_OVERLAP", "200"))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "0"))
+INGEST_CHECKPOINT_EVERY = int(os.getenv("INGEST_CHECKPOINT_EVERY", "10"))
+INGEST_CHECKPOINT_PATH = PROJECT_ROOT / os.getenv("INGEST_CHECKPOINT_PATH", "data/lore_index/ingest_checkpoint.json")
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+KEYWORD_STRONG_SCORE = float(os.getenv("KEYWORD_STRONG_SCORE", "2.0"))
+KEYWORD_STRONG_MARGIN = float(os.getenv("KEYWORD_STRONG_MARGIN", "1.5"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+SEMANTIC_ROUTER_ENABLED = os.getenv("SEMANTIC_ROUTER_ENABLED", "true").lower() == "true"
+SEMANTIC_ROUTER_THRESHOLD = float(os.getenv("SEMANTIC_ROUTER_THRESHOLD", "0.55"))
+SEMANTIC_ROUTER_CACHE_SIZE = int(os.getenv("SEMANTIC_ROUTER_CACHE_SIZE", "1024"))
+
+CONTEXT_TOKEN_BUDGETS = {
+    "story_generator": int(os.getenv("CONTEXT_TOKENS_STORY", "250")),
+    "npc_interaction": int(os.getenv("CONTEXT_TOKENS_NPC", "180")),
+    "default": int(os.getenv("CONTEXT_TOKENS_DEFAULT", "150"))
+}
+CONTEXT_MAX_DISTANCE = float(os.getenv("CONTEXT_MAX_DISTANCE", "0.8"))
+CONTEXT_MMR_LAMBDA = float(os.getenv("CONTEXT_MMR_LAMBDA", "0.7"))
+CONTEXT_DUPLICATE_THRESHOLD = float(os.getenv("CONTEXT_DUPLICATE_THRESHOLD", "0.8"))
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_PATH = PROJECT_ROOT / os.getenv("RESPONSE_CACHE_PATH", "data/response_cache.sqlite")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+RESPONSE_CACHE_VARIETY = int(os.getenv("RESPONSE_CACHE_VARIETY", "3"))
+RESPONSE_CACHE_SEMANTIC = os.getenv("RESPONSE_CACHE_SEMANTIC", "false").lower() == "true"
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.92"))
+
+METRICS_EXPORT_PATH = os.getenv("METRICS_EXPORT_PATH", "") or None
+METRICS_MAX_SAMPLES = int(os.getenv("METRICS_MAX_SAMPLES", "1000"))
+LLM_COST_PER_1K_PROMPT = float(os.getenv("LLM_COST_PER_1K_PROMPT", "0"))
+LLM_COST_PER_1K_COMPLETION = float(os.getenv("LLM_COST_PER_1K_COMPLETION", "0"))
+
+SPECULATION_ENABLED = os.getenv("SPECULATION_ENABLED", "true").lower() == "true"
+SPECULATION_GENERATE = os.getenv("SPECULATION_GENERATE", "false").lower() == "true"
+SPECULATION_MAX_ACTIONS = int(os.getenv("SPECULATION_MAX_ACTIONS", "3"))
+SPECULATION_LLM_BUDGET = int(os.getenv("SPECULATION_LLM_BUDGET", "1"))
+
+FAST_START = os.getenv("FAST_START", "true").lower() == "true"
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+
+STREAM_OUTPUT = os.getenv("STREAM_OUTPUT", "true").lower() == "true"
 
 DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
 LANGCHAIN_TRACING_V2 = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
@@ -30,29 +106,65 @@ SAVE_DIRECTORY.mkdir(parents=True, exist_ok=True)
 VECTOR_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
-def get_llm():
-    if LLM_PROVIDER == "openai":
+def get_model_name(provider: str) -> str:
+    if provider == "openai":
+        return OPENAI_MODEL
+    elif provider == "anthropic":
+        return ANTHROPIC_MODEL
+    elif provider == "ollama":
+        return OLLAMA_MODEL
+    elif provider == "local_stub":
+        return LOCAL_STUB_MODEL
+    else:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def create_llm(provider: str, model: str, temperature: float, http_client=None, http_async_client=None):
+    if provider == "openai":
         from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             api_key=OPENAI_API_KEY,
-            model=OPENAI_MODEL,
-            temperature=0.7
+            model=model,
+            temperature=temperature,
+            stream_usage=True,
+            http_client=http_client,
+            http_async_client=http_async_client
         )
-    elif LLM_PROVIDER == "anthropic":
+    elif provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
         return ChatAnthropic(
             api_key=ANTHROPIC_API_KEY,
-            model=ANTHROPIC_MODEL,
-            temperature=0.7
+            model=model,
+            temperature=temperature
         )
-    elif LLM_PROVIDER == "ollama":
+    elif provider == "ollama":
         from langchain_community.llms import Ollama
         return Ollama(
-            model=OLLAMA_MODEL,
-            base_url=OLLAMA_BASE_URL
+            model=model,
+            base_url=OLLAMA_BASE_URL,
+            temperature=temperature
+        )
+    elif provider == "local_stub":
+        from src.llm.local_stub import LocalStubChatModel
+        return LocalStubChatModel(
+            model_name=model,
+            seed=LOCAL_STUB_SEED,
+            latency_ms=LOCAL_STUB_LATENCY_MS,
+            tokens_per_second=LOCAL_STUB_TOKENS_PER_SECOND
         )
     else:
-        raise ValueError(f"Unknown LLM provider: {LLM_PROVIDER}")
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def get_llm(provider=None, model=None, temperature=None):
+    from src.llm.client_pool import get_client_pool
+    
+    provider = provider or LLM_PROVIDER
+    return get_client_pool().get(
+        provider=provider,
+        model=model or get_model_name(provider),
+        temperature=LLM_TEMPERATURE if temperature is None else temperature
+    )
 
 
 def get_embeddings():
@@ -1,20 +1,102 @@
 
-import json
-from typing import Optional
+import asyncio
+import threading
+from typing import Optional, Callable
 
 from src.game_state import GameState, create_initial_state
-from src.graph.graph import game_graph
-from src.persistence.save_manager import save_game, load_game, list_save_files, get_last_save
-from src.rag.vector_store import get_vector_store
+from src.world_data import get_world_data
+from src.config import SPECULATION_ENABLED, SEMANTIC_ROUTER_ENABLED, CHECKPOINT_ENABLED, JOURNAL_ENABLED
+from src.persistence.checkpointer import session_config
+from src.persistence.save_manager import (
+    save_game,
+    load_game,
+    asave_game,
+    aload_game,
+    list_save_files,
+    count_save_files,
+    get_last_save
+)
 from src.utils.display import *
+from src.utils.streaming import JsonFieldStreamer
+from src.utils.aio import run_sync
+from src.utils.metrics import get_metrics
+from src.utils.warmup import BackgroundWarmup, get_startup_profiler
+
+
+STREAMED_FIELDS = {
+    "story_generator": "narrative",
+    "npc_interaction": "dialogue"
+}
 
 
 class GameEngine:
     
     def __init__(self):
         self.state: Optional[GameState] = None
-        self.vector_store = get_vector_store()
-        self.graph = game_graph
+        self.last_output_streamed = False
+        self.warmup: Optional[BackgroundWarmup] = None
+        
+        self._graph = None
+        self._vector_store = None
+        self._speculator = None
+        self._checkpointer = None
+        self._journal = None
+        self._init_lock = threading.RLock()
+    
+    @property
+    def graph(self):
+        if self._graph is None:
+            with self._init_lock:
+                if self._graph is None:
+                    from src.graph.graph import game_graph
+                    self._graph = game_graph
+        return self._graph
+    
+    @property
+    def vector_store(self):
+        if self._vector_store is None:
+            with self._init_lock:
+                if self._vector_store is None:
+                    from src.rag.vector_store import get_vector_store
+                    self._vector_store = get_vector_store()
+        return self._vector_store
+    
+    @property
+    def speculator(self):
+        if self._speculator is None and SPECULATION_ENABLED:
+            with self._init_lock:
+                if self._speculator is None:
+                    from src.graph.speculation import SpeculationScheduler
+                    self._speculator = SpeculationScheduler(self.graph)
+        return self._speculator
+    
+    @property
+    def checkpointer(self):
+        if self._checkpointer is None and CHECKPOINT_ENABLED:
+            with self._init_lock:
+                if self._checkpointer is None:
+                    from src.persistence.checkpointer import get_checkpointer
+                    self._checkpointer = get_checkpointer()
+        return self._checkpointer
+    
+    @property
+    def journal(self):
+        if self._journal is None and JOURNAL_ENABLED:
+            with self._init_lock:
+                if self._journal is None:
+                    from src.persistence.journal import get_journal
+                    self._journal = get_journal()
+        return self._journal
+    
+    def start_background_warmup(self) -> BackgroundWarmup:
+        if self.warmup is None:
+            self.warmup = BackgroundWarmup(self, get_startup_profiler())
+            self.warmup.start()
+        return self.warmup
+    
+    def wait_until_ready(self):
+        if self.warmup is not None:
+            self.warmup.wait()
     
     def initialize_rag_system(self):
         print_info("Initializing game world lore...")
@@ -31,10 +113,7 @@ class GameEngine:
         self.state = create_initial_state(player_name)
         
         try:
-            with open("data/locations.json", "r") as f:
-                locations = json.load(f)
-            
-            tavern = locations.get("tavern", {})
+            tavern = get_world_data().locations.get("tavern", {})
             starting_narrative = f"\n{tavern.get('description', '')}\n"
             
             actions = "\n".join([f"- {a}" for a in tavern.get("available_actions", [])])
@@ -46,37 +125,177 @@ class GameEngine:
             print_error(f"Error loading location data: {e}")
             self.state["last_output"] = "You awaken in an unfamiliar place..."
         
+        self._schedule_speculation()
         return self.state
     
     def load_saved_game(self, filename: str) -> GameState:
-        self.state = load_game(filename)
+        return run_sync(self.aload_saved_game(filename))
+    
+    async def aload_saved_game(self, filename: str) -> GameState:
+        self.state = await aload_game(filename)
         print_success(f"Welcome back, {self.state['player_name']}!")
+        self._schedule_speculation()
         return self.state
     
+    def resume_last_session(self) -> Optional[GameState]:
+        return run_sync(self.aresume_last_session())
+    
+    async def aresume_last_session(self) -> Optional[GameState]:
+        state = None
+        
+        try:
+            if self.checkpointer is not None:
+                state = await self.checkpointer.aresume()
+            if self.journal is not None:
+                journaled = await asyncio.to_thread(self.journal.recover, state["session_id"] if state else None)
+                if journaled is not None and (state is None or journaled["turn_count"] > state["turn_count"]):
+                    state = journaled
+        except Exception as e:
+            print_error(f"Error resuming last session: {e}")
+            return None
+        
+        if state is None or state["health"] <= 0:
+            return None
+        
+        self.state = state
+        print_success(f"Welcome back, {self.state['player_name']}!")
+        self._schedule_speculation()
+        return self.state
+    
+    async def _aturn_graph(self):
+        if self.checkpointer is None:
+            return self.graph, {}
+        
+        try:
+            await self.checkpointer.asetup()
+        except Exception as e:
+            print_error(f"Autosave unavailable: {e}")
+            return self.graph, {}
+        return self.checkpointer.graph, {"config": session_config(self.state["session_id"]), "durability": "exit"}
+    
+    async def _apersist_turn(self, checkpointed: bool = False):
+        if self.journal is not None and not checkpointed:
+            try:
+                with get_metrics().timer("persist", "journal"):
+                    await asyncio.to_thread(self.journal.append, self.state)
+            except Exception as e:
+                print_error(f"Journal write failed: {e}")
+            return
+        
+        if self.checkpointer is None:
+            return
+        
+        try:
+            with get_metrics().timer("persist", "checkpoint"):
+                await self.checkpointer.apersist(self.state, checkpointed)
+        except Exception as e:
+            print_error(f"Autosave failed: {e}")
+    
     def save_current_game(self, filename: Optional[str] = None) -> str:
+        return run_sync(self.asave_current_game(filename))
+    
+    async def asave_current_game(self, filename: Optional[str] = None) -> str:
         if self.state is None:
             raise ValueError("No active game to save")
         
-        filepath = save_game(self.state, filename)
+        filepath = await asave_game(self.state, filename)
         print_success("Game saved successfully!")
         return filepath
     
-    def process_action(self, action: str) -> str:
+    def process_action(self, action: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+        return run_sync(self.aprocess_action(action, on_token))
+    
+    async def aprocess_action(self, action: str, on_token: Optional[Callable[[str], None]] = None) -> str:
         if self.state is None:
             raise ValueError("No active game")
         
+        await asyncio.to_thread(self.wait_until_ready)
+        
+        speculative = None
+        if self.speculator is not None:
+            speculative = await self.speculator.take(action, self.state)
+        
         self.state["current_action"] = action
+        self.last_output_streamed = False
+        
+        metrics = get_metrics()
+        turn = metrics.start_turn(action)
+        metrics.record_cache("speculation", hit=speculative is not None)
         
         try:
-            result = self.graph.invoke(self.state)
+            graph, run_options = await self._aturn_graph()
+            
+            if speculative is not None:
+                result = speculative
+            elif on_token is None:
+                result = await graph.ainvoke(self.state, **run_options)
+            else:
+                result = await self._astream_graph(on_token, graph, run_options)
             
             self.state.update(result)
+            await self._apersist_turn(checkpointed=speculative is None and bool(run_options))
+            self._schedule_speculation()
             
             return self.state["last_output"]
         
         except Exception as e:
             print_error(f"Error processing action: {e}")
             return "Something went wrong. Please try again."
+        
+        finally:
+            metrics.finish_turn(turn)
+    
+    def _schedule_speculation(self):
+        if self.warmup is not None and not self.warmup.ready.is_set():
+            return
+        if self.speculator is not None and self.state is not None and self.state["health"] > 0:
+            self.speculator.schedule(self.state)
+    
+    async def _astream_graph(self, on_token: Callable[[str], None], graph, run_options: dict) -> dict:
+        from src.graph.nodes import npc_speaker_prefix
+        
+        streamers = {}
+        closing = {}
+        result = {}
+        latest = self.state
+        
+        async for mode, chunk in graph.astream(self.state, stream_mode=["messages", "values"], **run_options):
+            if mode == "values":
+                result = latest = chunk
+                continue
+            
+            message, metadata = chunk
+            node = metadata.get("langgraph_node")
+            if node not in STREAMED_FIELDS:
+                continue
+            
+            if node not in streamers:
+                streamers[node] = JsonFieldStreamer(STREAMED_FIELDS[node])
+            
+            text = streamers[node].feed(getattr(message, "content", "") or "")
+            if text:
+                if node == "npc_interaction" and node not in closing:
+                    prefix = npc_speaker_prefix(latest)
+                    closing[node] = '"' if prefix else ""
+                    text = prefix + text
+                on_token(text)
+                self.last_output_streamed = True
+        
+        for suffix in closing.values():
+            if suffix:
+                on_token(suffix)
+        
+        return result
+    
+    def shutdown(self):
+        from src.llm.client_pool import get_client_pool
+        from src.llm.response_cache import get_response_cache
+        get_response_cache().flush()
+        if self._journal is not None:
+            self._journal.close()
+        if self._checkpointer is not None:
+            run_sync(self._checkpointer.aclose())
+        run_sync(get_client_pool().aclose())
     
     def get_state(self) -> Optional[GameState]:
         return self.state
@@ -87,5 +306,24 @@ class GameEngine:
         
         return self.state["health"] <= 0
     
-    def list_available_saves(self) -> list:
-        return list_save_files()
+    def list_available_saves(self, offset: int = 0, limit: Optional[int] = None) -> list:
+        return list_save_files(offset, limit)
+    
+    def count_available_saves(self) -> int:
+        return count_save_files()
+    
+    def get_performance_stats(self) -> dict:
+        from src.llm.client_pool import get_client_pool
+        from src.llm.response_cache import get_response_cache
+        
+        stats = get_metrics().snapshot()
+        stats["llm_pool"] = get_client_pool().stats()
+        stats["response_cache"] = get_response_cache().stats()
+        if self._vector_store is not None:
+            stats["query_embeddings"] = self._vector_store.query_cache.stats()
+        if SEMANTIC_ROUTER_ENABLED:
+            from src.graph.semantic_router import get_semantic_router
+            stats["semantic_router"] = get_semantic_router().stats()
+        if self._journal is not None:
+            stats["journal"] = dict(self._journal.stats)
+        return stats
@@ -2,9 +2,11 @@
 from typing import TypedDict, List, Dict, Optional, Literal, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
+import uuid
 
 
 class GameState(TypedDict):
+    session_id: str
     player_name: str
     current_location: str
     health: int
@@ -27,12 +29,30 @@ class GameState(TypedDict):
     game_flags: Dict[str, bool]
     
     current_action: str
+    parsed_action: Optional[Dict[str, Any]]
     last_output: str
     
     turn_count: int
     last_save_time: Optional[str]
 
 
+class ParsedAction(BaseModel):
+    text: str
+    intent: str = "story_generator"
+    intent_source: Literal["keyword", "semantic", "default"] = "default"
+    keywords: List[str] = Field(default_factory=list)
+    npcs: List[str] = Field(default_factory=list)
+    locations: List[str] = Field(default_factory=list)
+    items: List[str] = Field(default_factory=list)
+    amount: Optional[int] = None
+    amount_unit: Optional[str] = None
+    has_number: bool = False
+    is_receiving: bool = False
+    
+    def has(self, *keywords: str) -> bool:
+        return any(keyword in self.keywords for keyword in keywords)
+
+
 class InventoryAction(BaseModel):
     action: Literal["add", "remove", "use", "equip", "unequip"]
     item: str
@@ -101,6 +121,7 @@ def create_initial_state(player_name: str) -> GameState:
     from src.config import STARTING_HEALTH, STARTING_GOLD
     
     return GameState(
+        session_id=uuid.uuid4().hex,
         player_name=player_name,
         current_location="tavern",
         health=STARTING_HEALTH,
@@ -118,6 +139,7 @@ def create_initial_state(player_name: str) -> GameState:
         world_events=[],
         game_flags={},
         current_action="",
+        parsed_action=None,
         last_output="",
         turn_count=0,
         last_save_time=None
@@ -0,0 +1,200 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import SEMANTIC_ROUTER_ENABLED
+from src.game_state import GameState, ParsedAction
+from src.graph.semantic_router import get_semantic_router
+from src.utils.metrics import get_metrics
+from src.world_data import WorldData, get_world_data
+
+
+GIVE_WORDS = ["give", "tip", "donate", "pay", "offer", "here's", "here is", "take", "have"]
+CURRENCY_WORDS = ["gold", "coin", "money"]
+REST_WORDS = ["rest", "heal", "sleep", "recover"]
+TALK_WORDS = ["talk", "speak", "ask", "tell", "greet", "chat"]
+KNOWN_NPC_WORDS = ["keeper", "marta", "guard", "borin", "elara", "guardian", "merchant", "tobias", "bandit", "grimjaw"]
+COMBAT_WORDS = ["attack", "fight", "combat", "challenge", "punch", "hit", "strike"]
+TRAVEL_WORDS = ["go to", "travel", "walk", "head", "move", "visit", "leave"]
+USE_WORDS = ["use", "drink", "eat", "equip"]
+INVENTORY_WORDS = ["inventory", "check items", "show items"]
+RECEIVING_PATTERNS = [
+    "give me", "gives me", "gave me",
+    "take from", "taken from", "get from",
+    "receive from", "borrow from"
+]
+ROLE_WORDS = ["keeper", "guard", "guardian", "merchant", "trader"]
+OTHER_WORDS = ["drop", "quit", "exit"]
+
+KEYWORDS = list(dict.fromkeys(
+    GIVE_WORDS + CURRENCY_WORDS + REST_WORDS + TALK_WORDS + KNOWN_NPC_WORDS + COMBAT_WORDS
+    + TRAVEL_WORDS + USE_WORDS + INVENTORY_WORDS + RECEIVING_PATTERNS + ROLE_WORDS + OTHER_WORDS
+))
+
+AMOUNT_PATTERN = re.compile(r'(\d+)\s*(gold|coin|money|g\b)')
+
+
+class KeywordAutomaton:
+    
+    def __init__(self, patterns: Dict[str, List[Tuple[str, str]]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        
+        for pattern, labels in patterns.items():
+            node = 0
+            for char in pattern:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._output[node].extend(labels)
+        
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0) if node else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+    
+    def labels(self, text: str) -> Iterable[Tuple[str, str]]:
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            yield from self._output[node]
+
+
+class ActionParser:
+    
+    def __init__(self, world: Optional[WorldData] = None):
+        self.world = world or get_world_data()
+        self.locations = self.world.locations
+        self.items = self.world.items
+        
+        patterns: Dict[str, List[Tuple[str, str]]] = {}
+        
+        def add(pattern: str, kind: str, value: str):
+            if pattern:
+                patterns.setdefault(pattern, []).append((kind, value))
+        
+        for keyword in KEYWORDS:
+            add(keyword, "keyword", keyword)
+        
+        for key, location in self.locations.items():
+            add(key, "location", key)
+            add(location.get("name", "").lower(), "location", key)
+        
+        for key in self.items:
+            add(key.lower(), "item", key)
+            add(key.replace("_", " "), "item", key)
+        
+        self._automaton = KeywordAutomaton(patterns)
+    
+    def parse(self, action: str, location: Optional[str] = None, inventory: Optional[List[str]] = None) -> ParsedAction:
+        text = action.lower()
+        
+        found: Dict[str, set] = {"keyword": set(), "location": set(), "item": set()}
+        for kind, value in self._automaton.labels(text):
+            found[kind].add(value)
+        
+        items = []
+        for item in inventory or []:
+            if item in found["item"] or (item not in self.items and (item.lower() in text or item.replace("_", " ") in text)):
+                items.append(item)
+        
+        amount_match = AMOUNT_PATTERN.search(text)
+        
+        parsed = ParsedAction(
+            text=text,
+            keywords=sorted(found["keyword"]),
+            npcs=self.world.npc_index.candidates(text, location),
+            locations=[key for key in self.locations if key in found["location"]],
+            items=items,
+            amount=int(amount_match.group(1)) if amount_match else None,
+            amount_unit=amount_match.group(2) if amount_match else None,
+            has_number=any(char.isdigit() for char in text),
+            is_receiving=any(pattern in found["keyword"] for pattern in RECEIVING_PATTERNS)
+        )
+        
+        parsed.intent, parsed.intent_source = self._route(parsed, location)
+        return parsed
+    
+    def _route(self, parsed: ParsedAction, location: Optional[str]) -> Tuple[str, str]:
+        if parsed.has(*GIVE_WORDS):
+            if parsed.has(*CURRENCY_WORDS) or parsed.has_number:
+                return "inventory", "keyword"
+        
+        if parsed.has(*REST_WORDS):
+            return ("inventory" if location == "tavern" else "story_generator"), "keyword"
+        
+        if parsed.has(*TALK_WORDS):
+            return ("npc_interaction" if parsed.has(*KNOWN_NPC_WORDS) else "story_generator"), "keyword"
+        elif parsed.has(*COMBAT_WORDS):
+            return "combat", "keyword"
+        elif parsed.has(*TRAVEL_WORDS):
+            return "location_change", "keyword"
+        elif parsed.has(*USE_WORDS):
+            return "inventory", "keyword"
+        elif parsed.has(*INVENTORY_WORDS):
+            return "inventory", "keyword"
+        else:
+            return "story_generator", "default"
+    
+    def has_target(self, parsed: ParsedAction, intent: str, location: Optional[str]) -> bool:
+        if intent == "location_change":
+            connections = self.locations.get(location, {}).get("connections", ())
+            return any(key in connections for key in parsed.locations)
+        if intent == "npc_interaction":
+            return bool(parsed.npcs) or len(self.world.npcs_at(location)) == 1
+        if intent == "inventory":
+            return not parsed.items
+        return True
+
+
+_parser_instance: Optional[ActionParser] = None
+
+
+def get_action_parser() -> ActionParser:
+    global _parser_instance
+    world = get_world_data()
+    if _parser_instance is None or _parser_instance.world is not world:
+        _parser_instance = ActionParser(world)
+    return _parser_instance
+
+
+def parse_action(action: str, location: Optional[str] = None, inventory: Optional[List[str]] = None) -> ParsedAction:
+    parser = get_action_parser()
+    parsed = parser.parse(action, location, inventory)
+    
+    if parsed.intent_source == "default" and SEMANTIC_ROUTER_ENABLED:
+        try:
+            intent = get_semantic_router().route(parsed.text)
+        except Exception as e:
+            print(f"Semantic routing error: {e}")
+            intent = None
+        
+        if intent and parser.has_target(parsed, intent, location):
+            parsed.intent, parsed.intent_source = intent, "semantic"
+    
+    return parsed
+
+
+def get_parsed_action(state: GameState) -> ParsedAction:
+    parsed = state.get("parsed_action")
+    if parsed and parsed.get("text") == state["current_action"].lower():
+        return ParsedAction(**parsed)
+    return parse_action(state["current_action"], state.get("current_location"), state.get("inventory"))
+
+
+def parse_action_node(state: GameState) -> Dict:
+    parsed = parse_action(state["current_action"], state["current_location"], state["inventory"])
+    get_metrics().increment(f"routing.{parsed.intent_source}")
+    return {"parsed_action": parsed.model_dump()}
@@ -10,19 +10,25 @@ from src.graph.nodes import (
     inventory_node
 )
 from src.graph.edges import route_action, should_continue
+from src.graph.action_parser import parse_action_node
+from src.utils.metrics import timed_node
 
 
-def create_game_graph():
+def create_game_graph(checkpointer=None):
     workflow = StateGraph(GameState)
     
-    workflow.add_node("story_generator", story_generator_node)
-    workflow.add_node("npc_interaction", npc_interaction_node)
-    workflow.add_node("combat", combat_node)
-    workflow.add_node("location_change", location_change_node)
-    workflow.add_node("inventory", inventory_node)
-    workflow.add_node("state_update", state_update_node)
+    workflow.add_node("parse_action", timed_node("parse_action", parse_action_node))
+    workflow.add_node("story_generator", timed_node("story_generator", story_generator_node))
+    workflow.add_node("npc_interaction", timed_node("npc_interaction", npc_interaction_node))
+    workflow.add_node("combat", timed_node("combat", combat_node))
+    workflow.add_node("location_change", timed_node("location_change", location_change_node))
+    workflow.add_node("inventory", timed_node("inventory", inventory_node))
+    workflow.add_node("state_update", timed_node("state_update", state_update_node))
     
-    workflow.set_conditional_entry_point(
+    workflow.set_entry_point("parse_action")
+    
+    workflow.add_conditional_edges(
+        "parse_action",
         route_action,
         {
             "story_generator": "story_generator",
@@ -41,7 +47,7 @@ def create_game_graph():
     
     workflow.add_edge("state_update", END)
     
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
     
     return app
 
@@ -1,14 +1,20 @@
 
 import json
-from typing import Dict
+import time
+from typing import Dict, List, Optional, Tuple
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from src.game_state import GameState, StoryOutput, NPCDialogue, CombatAction, LocationChange
+from src.world_data import get_world_data
+from src.graph.action_parser import get_parsed_action, GIVE_WORDS, REST_WORDS
 from src.config import get_llm
-from src.rag.retriever import get_retriever
+from src.llm.response_cache import get_response_cache
+from src.utils.metrics import get_metrics
+from src.rag.retriever import get_retriever, RetrievalSpec
 from src.prompts.system_prompts import (
     format_story_prompt,
     format_npc_prompt,
+    get_relationship_band,
     COMBAT_NARRATOR_PROMPT
 )
 from src.tools.dice import combat_roll, d20_roll
@@ -16,37 +22,100 @@ from src.tools.inventory import use_item
 import json as json_module
 
 
-def story_generator_node(state: GameState) -> Dict:
-    print("[Node: Story Generator]")
+def get_model_label(llm) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+
+async def generate_text(llm, messages, node: str) -> str:
+    start = time.perf_counter()
+    chunks = []
+    usage = None
     
-    retriever = get_retriever()
-    lore_context = retriever.get_action_context(
-        action=state["current_action"],
-        location=state["current_location"],
-        n_results=2
-    )
+    async for chunk in llm.astream(messages):
+        chunks.append(getattr(chunk, "content", chunk))
+        if getattr(chunk, "usage_metadata", None):
+            usage = chunk.usage_metadata
     
-    prompt = format_story_prompt(
-        location=state["current_location"],
-        action=state["current_action"],
-        lore_context=lore_context
+    content = "".join(chunks)
+    
+    if usage:
+        prompt_tokens = usage.get("input_tokens", 0)
+        completion_tokens = usage.get("output_tokens", 0)
+    else:
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        completion_tokens = len(content) // 4
+    
+    get_metrics().record_llm(
+        node=node,
+        model=get_model_label(llm),
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        wall_ms=(time.perf_counter() - start) * 1000
     )
     
-    llm = get_llm()
+    return content
+
+
+def story_context_specs(action: str, location: str):
+    return [
+        RetrievalSpec.action(action, location, k=3),
+        RetrievalSpec.location(location, k=2)
+    ]
+
+
+def npc_context_specs(npc_name: str, location: str):
+    return [
+        RetrievalSpec.npc(npc_name, k=3),
+        RetrievalSpec.location(location, k=1)
+    ]
+
+
+async def story_generator_node(state: GameState) -> Dict:
+    cache = get_response_cache()
+    metrics = get_metrics()
     
     try:
-        messages = [
-            SystemMessage(content=prompt),
-            HumanMessage(content=f"Generate narrative for: {state['current_action']}")
-        ]
+        content = await cache.aget(
+            "story_generator",
+            state["current_location"],
+            state["current_action"],
+            player=state["player_name"]
+        )
+        metrics.record_cache("story_generator", hit=content is not None)
         
-        response = llm.invoke(messages)
+        if content is None:
+            retriever = get_retriever()
+            with metrics.timer("retrieval", "story_generator"):
+                groups = await retriever.asearch_batch(
+                    story_context_specs(state["current_action"], state["current_location"])
+                )
+            lore_context = [result for group in groups for result in group]
+            
+            prompt = format_story_prompt(
+                location=state["current_location"],
+                action=state["current_action"],
+                lore_context=lore_context
+            )
+            
+            messages = [
+                SystemMessage(content=prompt),
+                HumanMessage(content=f"Generate narrative for: {state['current_action']}")
+            ]
+            
+            content = await generate_text(get_llm(), messages, node="story_generator")
+            await cache.aput(
+                "story_generator",
+                state["current_location"],
+                state["current_action"],
+                content,
+                player=state["player_name"]
+            )
         
         try:
-            story_data = json.loads(response.content)
-            narrative = story_data.get("narrative", response.content)
+            story_data = json.loads(content)
+            narrative = story_data.get("narrative", content)
         except json.JSONDecodeError:
-            narrative = response.content
+            narrative = content
         
         return {
             "last_output": narrative
@@ -59,83 +128,101 @@ def story_generator_node(state: GameState) -> Dict:
         }
 
 
-def npc_interaction_node(state: GameState) -> Dict:
-    print("[Node: NPC Interaction]")
-    
-    action = state["current_action"].lower()
+def resolve_npc_key(state: GameState) -> Optional[str]:
+    parsed = get_parsed_action(state)
+    if parsed.npcs:
+        return parsed.npcs[0]
     
+    location_npcs = get_world_data().npcs_at(state["current_location"])
+    return location_npcs[0] if len(location_npcs) == 1 else None
+
+
+def npc_speaker_prefix(state: GameState) -> str:
+    npc_key = resolve_npc_key(state)
+    return f"{get_world_data().npcs[npc_key]['name']}: \"" if npc_key else ""
+
+
+def context_specs(state: GameState) -> List[RetrievalSpec]:
+    intent = get_parsed_action(state).intent
+    if intent == "story_generator":
+        return story_context_specs(state["current_action"], state["current_location"])
+    
+    if intent == "npc_interaction":
+        npc_key = resolve_npc_key(state)
+        if npc_key is not None:
+            return npc_context_specs(get_world_data().npcs[npc_key]["name"], state["current_location"])
+    return []
+
+
+def parse_npc_response(content: str) -> Tuple[str, int]:
     try:
-        with open("data/npcs.json", "r") as f:
-            npc_data = json.load(f)
-    except Exception as e:
-        print(f"Error loading NPC data: {e}")
-        return {}
-    
-    npc_key = None
-    for key, npc in npc_data.items():
-        if key.replace("_", " ") in action:
-            npc_key = key
-            break
-        if npc["name"].lower() in action:
-            npc_key = key
-            break
-        npc_words = npc["name"].lower().split()
-        if any(word in action for word in npc_words if len(word) > 3):
-            npc_key = key
-            break
-        if npc.get("location") == state["current_location"]:
-            if "keeper" in action and "tavern_keeper" == key:
-                npc_key = key
-                break
-            if "guard" in action and "castle_guard" == key:
-                npc_key = key
-                break
-            if "guardian" in action and "forest_guardian" == key:
-                npc_key = key
-                break
-            if "merchant" in action or "trader" in action and "merchant" in key:
-                npc_key = key
-                break
-    
+        npc_response = json.loads(content)
+        return npc_response.get("dialogue", content), npc_response.get("relationship_change", 0)
+    except json.JSONDecodeError:
+        return content, 0
+
+
+async def npc_interaction_node(state: GameState) -> Dict:
+    npc_key = resolve_npc_key(state)
     if not npc_key:
-        location_npcs = [key for key, npc in npc_data.items() if npc.get("location") == state["current_location"]]
-        if len(location_npcs) == 1:
-            npc_key = location_npcs[0]
-        else:
-            return {
-                "last_output": "There's no one here to talk to. Try being more specific, like 'talk to the tavern keeper'."
-            }
+        return {
+            "last_output": "There's no one here to talk to. Try being more specific, like 'talk to the tavern keeper'."
+        }
     
-    npc = npc_data[npc_key]
+    npc = get_world_data().npcs[npc_key]
     
     current_relationship = state["npc_relationships"].get(npc["name"], npc.get("initial_relationship", 0))
+    relationship_band = get_relationship_band(current_relationship)
     
-    prompt = format_npc_prompt(
-        npc_data=npc,
-        player_name=state["player_name"],
-        current_location=state["current_location"],
-        player_action=state["current_action"],
-        conversation_history=state["conversation_history"],
-        relationship=current_relationship
-    )
-    
-    llm = get_llm()
+    cache = get_response_cache()
     
     try:
-        messages = [
-            SystemMessage(content=prompt),
-            HumanMessage(content=state["current_action"])
-        ]
+        cached = await cache.aget(
+            "npc_interaction",
+            state["current_location"],
+            state["current_action"],
+            npc=npc_key,
+            relationship_band=relationship_band,
+            player=state["player_name"]
+        )
+        get_metrics().record_cache("npc_interaction", hit=cached is not None)
         
-        response = llm.invoke(messages)
-        
-        try:
-            npc_response = json.loads(response.content)
-            dialogue = npc_response.get("dialogue", response.content)
-            relationship_change = npc_response.get("relationship_change", 0)
-        except json.JSONDecodeError:
-            dialogue = response.content
-            relationship_change = 0
+        if cached is not None:
+            dialogue, relationship_change = parse_npc_response(cached)
+        else:
+            with get_metrics().timer("retrieval", "npc_interaction"):
+                groups = await get_retriever().asearch_batch(
+                    npc_context_specs(npc["name"], state["current_location"])
+                )
+            
+            prompt = format_npc_prompt(
+                npc_data=npc,
+                player_name=state["player_name"],
+                current_location=state["current_location"],
+                player_action=state["current_action"],
+                conversation_history=state["conversation_history"],
+                relationship=current_relationship,
+                lore_context=[result for group in groups for result in group]
+            )
+            
+            messages = [
+                SystemMessage(content=prompt),
+                HumanMessage(content=state["current_action"])
+            ]
+            
+            content = await generate_text(get_llm(), messages, node="npc_interaction")
+            
+            dialogue, relationship_change = parse_npc_response(content)
+            
+            await cache.aput(
+                "npc_interaction",
+                state["current_location"],
+                state["current_action"],
+                json.dumps({"dialogue": dialogue, "relationship_change": relationship_change}),
+                npc=npc_key,
+                relationship_band=relationship_band,
+                player=state["player_name"]
+            )
         
         new_history = state["conversation_history"].copy()
         new_history.append({
@@ -166,8 +253,6 @@ def npc_interaction_node(state: GameState) -> Dict:
 
 
 def combat_node(state: GameState) -> Dict:
-    print("[Node: Combat]")
-    
     combat_active = state["game_flags"].get("combat_active", False)
     
     if not combat_active:
@@ -263,28 +348,19 @@ def combat_node(state: GameState) -> Dict:
 
 
 def location_change_node(state: GameState) -> Dict:
-    print("[Node: Location Change]")
-    
-    try:
-        with open("data/locations.json", "r") as f:
-            locations = json.load(f)
-    except Exception as e:
-        print(f"Error loading locations: {e}")
-        return {}
-    
-    action = state["current_action"].lower()
+    locations = get_world_data().locations
+    parsed = get_parsed_action(state)
     current_loc = state["current_location"]
     
     target_location = None
-    for loc_key, loc_data in locations.items():
-        if loc_key in action or loc_data["name"].lower() in action:
-            if current_loc in locations and loc_key in locations[current_loc].get("connections", []):
-                target_location = loc_key
-                break
-            elif current_loc == loc_key:
-                return {
-                    "last_output": f"You're already at {loc_data['name']}."
-                }
+    for loc_key in parsed.locations:
+        if current_loc in locations and loc_key in locations[current_loc].get("connections", []):
+            target_location = loc_key
+            break
+        elif current_loc == loc_key:
+            return {
+                "last_output": f"You're already at {locations[loc_key]['name']}."
+            }
     
     if target_location:
         loc_data = locations[target_location]
@@ -304,8 +380,6 @@ def location_change_node(state: GameState) -> Dict:
 
 
 def state_update_node(state: GameState) -> Dict:
-    print("[Node: State Update]")
-    
     new_turn = state["turn_count"] + 1
     
     health = min(state["health"], state["max_health"])
@@ -321,11 +395,9 @@ def state_update_node(state: GameState) -> Dict:
 
 
 def inventory_node(state: GameState) -> Dict:
-    print("[Node: Inventory]")
+    parsed = get_parsed_action(state)
     
-    action = state["current_action"].lower()
-    
-    if any(word in action for word in ["rest", "heal", "sleep", "recover"]):
+    if parsed.has(*REST_WORDS):
         if state["current_location"] == "tavern":
             if state["health"] < state["max_health"]:
                 health_restored = state["max_health"] - state["health"]
@@ -342,23 +414,11 @@ def inventory_node(state: GameState) -> Dict:
                 "last_output": "You can only rest and recover at the tavern."
             }
     
-    give_keywords = ["give", "tip", "donate", "pay", "offer", "here's", "here is", "take", "have"]
-    if any(word in action for word in give_keywords):
-        receiving_patterns = [
-            "give me", "gives me", "gave me",
-            "take from", "taken from", "get from",
-            "receive from", "borrow from"
-        ]
-        
-        is_trying_to_receive = any(pattern in action for pattern in receiving_patterns)
-        
-        import re
-        gold_match = re.search(r'(\d+)\s*(gold|coin|money|g\b)', action)
-        
-        if gold_match:
-            amount = int(gold_match.group(1))
+    if parsed.has(*GIVE_WORDS):
+        if parsed.amount is not None:
+            amount = parsed.amount
             
-            if is_trying_to_receive:
+            if parsed.is_receiving:
                 return {
                     "last_output": (
                         f"You can't just take gold from NPCs! 💰\n\n"
@@ -377,55 +437,32 @@ def inventory_node(state: GameState) -> Dict:
             
             new_gold = state["gold"] - amount
             
-            recipient = None
-            if "keeper" in action or "marta" in action:
-                recipient = "Marta the Tavern Keeper"
-            elif "guard" in action or "borin" in action:
-                recipient = "Captain Borin"
-            elif "merchant" in action or "tobias" in action:
-                recipient = "Tobias the Merchant"
-            elif "guardian" in action or "elara" in action:
-                recipient = "Elara Moonwhisper"
-            else:
-                try:
-                    import json
-                    with open("data/npcs.json", "r") as f:
-                        npc_data = json.load(f)
-                    
-                    for key, npc in npc_data.items():
-                        if npc.get("location") == state["current_location"]:
-                            recipient = npc["name"]
-                            break
-                except:
-                    pass
-            
-            if not recipient:
-                recipient = "someone"
+            world = get_world_data()
+            location_npcs = world.npcs_at(state["current_location"])
+            recipient_key = parsed.npcs[0] if parsed.npcs else (location_npcs[0] if location_npcs else None)
+            recipient = world.npcs[recipient_key]["name"] if recipient_key else "someone"
             
             return {
                 "gold": new_gold,
                 "last_output": f"You give {amount} gold to {recipient}. You now have {new_gold} gold remaining."
             }
         
-        for item in state["inventory"]:
-            if item.lower() in action or item.replace("_", " ") in action:
-                new_inventory = state["inventory"].copy()
-                new_inventory.remove(item)
-                return {
-                    "inventory": new_inventory,
-                    "last_output": f"You give {item} away. It's no longer in your inventory."
-                }
+        if parsed.items:
+            item = parsed.items[0]
+            new_inventory = state["inventory"].copy()
+            new_inventory.remove(item)
+            return {
+                "inventory": new_inventory,
+                "last_output": f"You give {item} away. It's no longer in your inventory."
+            }
         
         return {
             "last_output": "What do you want to give? Specify an item from your inventory or an amount of gold (e.g., 'give 5 gold')."
         }
     
-    if "drop" in action:
-        import re
-        gold_match = re.search(r'(\d+)\s*(gold|coin)', action)
-        
-        if gold_match:
-            amount = int(gold_match.group(1))
+    if parsed.has("drop"):
+        if parsed.amount is not None and parsed.amount_unit in ("gold", "coin"):
+            amount = parsed.amount
             if amount > state["gold"]:
                 return {
                     "last_output": f"You don't have {amount} gold to drop."
@@ -436,21 +473,17 @@ def inventory_node(state: GameState) -> Dict:
                 "last_output": f"You drop {amount} gold on the ground. You now have {new_gold} gold."
             }
         
-        for item in state["inventory"]:
-            if item.lower() in action or item.replace("_", " ") in action:
-                new_inventory = state["inventory"].copy()
-                new_inventory.remove(item)
-                return {
-                    "inventory": new_inventory,
-                    "last_output": f"You drop {item} on the ground."
-                }
+        if parsed.items:
+            item = parsed.items[0]
+            new_inventory = state["inventory"].copy()
+            new_inventory.remove(item)
+            return {
+                "inventory": new_inventory,
+                "last_output": f"You drop {item} on the ground."
+            }
     
-    if "use" in action or "drink" in action or "eat" in action:
-        item_to_use = None
-        for item in state["inventory"]:
-            if item.lower() in action or item.replace("_", " ") in action:
-                item_to_use = item
-                break
+    if parsed.has("use", "drink", "eat"):
+        item_to_use = parsed.items[0] if parsed.items else None
         
         if item_to_use:
             result = use_item(state["inventory"], item_to_use)
@@ -467,10 +500,19 @@ def inventory_node(state: GameState) -> Dict:
             
             return updates
     
-    elif "inventory" in action or "check items" in action:
+    elif parsed.has("inventory", "check items"):
         items_list = "\n".join([f"- {item}" for item in state["inventory"]])
         return {
             "last_output": f"Your inventory:\n{items_list}\n\nGold: {state['gold']}"
         }
     
-    return {}
+    if parsed.intent_source != "semantic":
+        return {}
+    
+    items_list = "\n".join([f"- {item}" for item in state["inventory"]]) or "- (empty)"
+    return {
+        "last_output": (
+            f"Your inventory:\n{items_list}\n\nGold: {state['gold']}\n\n"
+            f"Try 'use <item>', 'give <item>', 'drop <item>' or 'give 5 gold'."
+        )
+    }
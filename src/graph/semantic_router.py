@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import (
+    SEMANTIC_ROUTER_THRESHOLD,
+    SEMANTIC_ROUTER_CACHE_SIZE
+)
+from src.llm.response_cache import normalize_action
+from src.world_data import get_world_data
+
+
+def _embed_with_vector_store(texts: List[str]) -> List[List[float]]:
+    from src.rag.vector_store import get_vector_store
+    return get_vector_store().embed_queries(texts)
+
+
+def _normalized(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class SemanticRouter:
+    
+    def __init__(
+        self,
+        exemplars: Optional[Dict[str, List[str]]] = None,
+        embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        threshold: float = SEMANTIC_ROUTER_THRESHOLD,
+        cache_size: int = SEMANTIC_ROUTER_CACHE_SIZE
+    ):
+        self.world = None if exemplars is not None else get_world_data()
+        self.exemplars = exemplars if exemplars is not None else self.world.files.get("route_exemplars", {})
+        self.embed_fn = embed_fn or _embed_with_vector_store
+        self.threshold = threshold
+        self.cache_size = cache_size
+        
+        self._routes: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counts = {"hit": 0, "miss": 0, "routed": 0, "below_threshold": 0}
+    
+    def _reload_exemplars(self):
+        world = get_world_data()
+        if self.world is None or world is self.world:
+            return
+        
+        self.world = world
+        self.exemplars = world.files.get("route_exemplars", {})
+        self._matrix = None
+        self._cache.clear()
+    
+    def prepare(self) -> Tuple[List[str], np.ndarray]:
+        with self._lock:
+            self._reload_exemplars()
+            if self._matrix is not None:
+                return self._routes, self._matrix
+            
+            routes, texts = [], []
+            for route, phrases in self.exemplars.items():
+                for phrase in phrases:
+                    routes.append(route)
+                    texts.append(phrase)
+            
+            self._routes = routes
+            self._matrix = _normalized(self.embed_fn(texts)) if texts else np.zeros((0, 0), dtype=np.float32)
+            return self._routes, self._matrix
+    
+    def nearest(self, text: str) -> Tuple[Optional[str], float]:
+        key = normalize_action(text)
+        if not key:
+            return None, 0.0
+        
+        routes, matrix = self.prepare()
+        if not routes:
+            return None, 0.0
+        
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.counts["hit"] += 1
+                return self._cache[key]
+            self.counts["miss"] += 1
+        
+        scores = matrix @ _normalized([self.embed_fn([text])[0]])[0]
+        best = int(np.argmax(scores))
+        result = (routes[best], float(scores[best]))
+        
+        with self._lock:
+            if self._matrix is not matrix:
+                return result
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return result
+    
+    def route(self, text: str) -> Optional[str]:
+        route, score = self.nearest(text)
+        
+        with self._lock:
+            if route is None or score < self.threshold:
+                self.counts["below_threshold"] += 1
+                return None
+            self.counts["routed"] += 1
+        return route
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.counts["hit"] + self.counts["miss"]
+            return {
+                "exemplars": len(self._routes),
+                "cached_actions": len(self._cache),
+                **self.counts,
+                "hit_rate": round(self.counts["hit"] / lookups, 3) if lookups else 0.0
+            }
+
+
+_router_instance: Optional[SemanticRouter] = None
+
+
+def get_semantic_router() -> SemanticRouter:
+    global _router_instance
+    if _router_instance is None:
+        _router_instance = SemanticRouter()
+    return _router_instance
@@ -0,0 +1,138 @@
+import asyncio
+import copy
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+from src.config import (
+    SPECULATION_GENERATE,
+    SPECULATION_MAX_ACTIONS,
+    SPECULATION_LLM_BUDGET
+)
+from src.game_state import GameState
+from src.graph.nodes import context_specs
+from src.llm.response_cache import defer_cache_writes, get_response_cache, normalize_action
+from src.rag.retriever import get_retriever
+from src.utils.aio import get_background_loop
+from src.utils.metrics import suppress_metrics
+from src.world_data import get_world_data
+
+
+def state_fingerprint(state: GameState) -> str:
+    relevant = {key: value for key, value in state.items() if key not in ("current_action", "last_output", "parsed_action")}
+    encoded = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def as_player_action(result: Dict, action: str, history_start: int) -> Dict:
+    suggestion = result["current_action"]
+    history = [
+        dict(entry, message=action) if i >= history_start and entry.get("message") == suggestion else entry
+        for i, entry in enumerate(result.get("conversation_history", []))
+    ]
+    return dict(result, current_action=action, conversation_history=history)
+
+
+class SpeculationScheduler:
+    
+    def __init__(
+        self,
+        graph,
+        max_actions: int = SPECULATION_MAX_ACTIONS,
+        generate: bool = SPECULATION_GENERATE,
+        llm_budget: int = SPECULATION_LLM_BUDGET
+    ):
+        self.graph = graph
+        self.max_actions = max_actions
+        self.generate = generate
+        self.llm_budget = llm_budget
+        
+        self._tasks: Dict[str, Tuple[asyncio.Task, bool]] = {}
+        self._fingerprint: Optional[str] = None
+        
+        self.stats = {"scheduled": 0, "generated": 0, "used": 0, "discarded": 0, "cancelled": 0}
+    
+    def _suggested_actions(self, location: str) -> List[str]:
+        actions = get_world_data().locations.get(location, {}).get("available_actions", ())
+        return actions[:self.max_actions]
+    
+    def schedule(self, state: GameState):
+        snapshot = copy.deepcopy(dict(state))
+        
+        try:
+            asyncio.get_running_loop()
+            self._schedule(snapshot)
+        except RuntimeError:
+            get_background_loop().call_soon_threadsafe(self._schedule, snapshot)
+    
+    def _schedule(self, snapshot: Dict):
+        self.cancel()
+        self._fingerprint = state_fingerprint(snapshot)
+        
+        for i, action in enumerate(self._suggested_actions(snapshot["current_location"])):
+            generate = self.generate and i < self.llm_budget
+            task = asyncio.get_running_loop().create_task(
+                self._speculate(action, snapshot, generate)
+            )
+            self._tasks[normalize_action(action)] = (task, generate)
+            self.stats["scheduled"] += 1
+    
+    async def _speculate(self, action: str, snapshot: Dict, generate: bool) -> Optional[Tuple[Dict, List[tuple]]]:
+        suppress_metrics()
+        deferred = defer_cache_writes()
+        
+        try:
+            spec_state = copy.deepcopy(snapshot)
+            spec_state["current_action"] = action
+            
+            specs = await asyncio.to_thread(context_specs, spec_state)
+            if specs:
+                await get_retriever().aprefetch(specs)
+            
+            if generate:
+                result = await self.graph.ainvoke(spec_state)
+                self.stats["generated"] += 1
+                return result, deferred
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Speculation error for '{action}': {e}")
+        
+        return None
+    
+    async def take(self, action: str, state: GameState) -> Optional[Dict]:
+        task, generate = self._tasks.pop(normalize_action(action), (None, False))
+        fingerprint = self._fingerprint
+        
+        self.cancel()
+        
+        if task is None or not generate:
+            return None
+        
+        if fingerprint != state_fingerprint(state):
+            task.cancel()
+            self.stats["discarded"] += 1
+            return None
+        
+        try:
+            outcome = await task
+        except asyncio.CancelledError:
+            return None
+        
+        if outcome is None:
+            return None
+        
+        result, deferred = outcome
+        await get_response_cache().apromote(deferred)
+        self.stats["used"] += 1
+        return as_player_action(result, action, len(state["conversation_history"]))
+    
+    def cancel(self):
+        for task, _ in self._tasks.values():
+            if not task.done():
+                task.cancel()
+                self.stats["cancelled"] += 1
+            elif not task.cancelled() and task.result() is not None:
+                self.stats["discarded"] += 1
+        self._tasks.clear()
+        self._fingerprint = None
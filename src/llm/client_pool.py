@@ -0,0 +1,144 @@
+import threading
+import time
+from typing import Dict, Tuple, Optional, Any
+
+from src.config import (
+    create_llm,
+    LLM_POOL_MAX_CONNECTIONS,
+    LLM_POOL_MAX_KEEPALIVE,
+    LLM_POOL_KEEPALIVE_EXPIRY,
+    LLM_REQUEST_TIMEOUT
+)
+
+
+HTTPX_PROVIDERS = {"openai"}
+
+
+class PooledClient:
+    
+    def __init__(self, llm: Any, http_client=None, http_async_client=None):
+        self.llm = llm
+        self.http_client = http_client
+        self.http_async_client = http_async_client
+        self.created_at = time.time()
+        self.hits = 0
+    
+    def close(self):
+        if self.http_client is not None:
+            self.http_client.close()
+    
+    async def aclose(self):
+        self.close()
+        if self.http_async_client is not None:
+            await self.http_async_client.aclose()
+
+
+class LLMClientPool:
+    
+    def __init__(
+        self,
+        max_connections: int = LLM_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = LLM_POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = LLM_POOL_KEEPALIVE_EXPIRY,
+        timeout: float = LLM_REQUEST_TIMEOUT
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        
+        self._clients: Dict[Tuple[str, str, float], PooledClient] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _build_http_clients(self, provider: str):
+        if provider not in HTTPX_PROVIDERS:
+            return None, None
+        
+        import httpx
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        return (
+            httpx.Client(limits=limits, timeout=self.timeout),
+            httpx.AsyncClient(limits=limits, timeout=self.timeout)
+        )
+    
+    def get(self, provider: str, model: str, temperature: float):
+        key = (provider, model, float(temperature))
+        
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    http_client, http_async_client = self._build_http_clients(provider)
+                    llm = create_llm(
+                        provider,
+                        model,
+                        temperature,
+                        http_client=http_client,
+                        http_async_client=http_async_client
+                    )
+                    client = PooledClient(llm, http_client, http_async_client)
+                    self._clients[key] = client
+                    self.misses += 1
+                    return client.llm
+        
+        with self._lock:
+            client.hits += 1
+            self.hits += 1
+        return client.llm
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "clients": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "per_client": {
+                    f"{provider}:{model}@{temperature}": {
+                        "hits": client.hits,
+                        "age_seconds": round(time.time() - client.created_at, 1)
+                    }
+                    for (provider, model, temperature), client in self._clients.items()
+                }
+            }
+    
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                try:
+                    client.close()
+                except Exception as e:
+                    print(f"Error closing LLM client: {e}")
+            self._clients.clear()
+    
+    async def aclose(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"Error closing LLM client: {e}")
+
+
+_client_pool_instance: Optional[LLMClientPool] = None
+_client_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> LLMClientPool:
+    global _client_pool_instance
+    if _client_pool_instance is None:
+        with _client_pool_lock:
+            if _client_pool_instance is None:
+                _client_pool_instance = LLMClientPool()
+    return _client_pool_instance
@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+STORY_OPENINGS = [
+    "The air grows still as you {action}.",
+    "Shadows shift around you while you {action}.",
+    "A cold wind stirs as you {action}.",
+    "Somewhere in the distance a bell tolls as you {action}."
+]
+
+STORY_DETAILS = [
+    "The smell of woodsmoke and damp earth lingers around {location}.",
+    "Faint voices drift through {location}, too quiet to make out.",
+    "Old stone and older secrets surround you at {location}.",
+    "Torchlight flickers across {location}, painting long shadows."
+]
+
+STORY_CLOSINGS = [
+    "Something here seems worth a closer look.",
+    "You sense that your choice has not gone unnoticed.",
+    "The moment passes, but the feeling of being watched remains.",
+    "For now, all is quiet."
+]
+
+STORY_ACTIONS = [
+    "Look around",
+    "Talk to someone nearby",
+    "Check inventory",
+    "Rest for a moment",
+    "Travel onward"
+]
+
+NPC_LINES = [
+    "Well met, traveler. What brings you to me?",
+    "I have little time, but I will hear you out.",
+    "Speak plainly. These are uncertain days.",
+    "Ah, a new face. Stay a while and we can talk.",
+    "Careful what you ask for around here."
+]
+
+TONES = ["dramatic", "mysterious", "casual", "peaceful"]
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r"\S+\s*", text)
+
+
+class LocalStubChatModel(BaseChatModel):
+    model_name: str = "local-stub"
+    seed: int = 0
+    latency_ms: float = 250.0
+    tokens_per_second: float = 40.0
+    
+    @property
+    def _llm_type(self) -> str:
+        return "local_stub"
+    
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {
+            "model_name": self.model_name,
+            "seed": self.seed,
+            "latency_ms": self.latency_ms,
+            "tokens_per_second": self.tokens_per_second
+        }
+    
+    def _rng(self, messages: List[BaseMessage]) -> random.Random:
+        digest = hashlib.sha256()
+        for message in messages:
+            digest.update(str(message.content).encode("utf-8"))
+        return random.Random(f"{self.seed}:{digest.hexdigest()}")
+    
+    @staticmethod
+    def _find(pattern: str, text: str, default: str) -> str:
+        match = re.search(pattern, text)
+        return match.group(1).strip() if match else default
+    
+    def _build_response(self, messages: List[BaseMessage]) -> str:
+        rng = self._rng(messages)
+        system = "\n".join(str(m.content) for m in messages if m.type == "system")
+        
+        if '"dialogue"' in system:
+            npc_name = self._find(r"You are (.+?), a character", system, "The stranger")
+            return json.dumps({
+                "dialogue": f"{rng.choice(NPC_LINES)} I am {npc_name}.",
+                "relationship_change": rng.choice([-1, 0, 0, 1, 2]),
+                "quest_offered": None,
+                "items_given": [],
+                "information_revealed": []
+            })
+        
+        if '"narrative"' in system:
+            location = self._find(r"Location: (.+)", system, "this place").replace("_", " ")
+            action = self._find(r"Player Action: (.+)", system, "look around").lower()
+            narrative = " ".join([
+                rng.choice(STORY_OPENINGS).format(action=action),
+                rng.choice(STORY_DETAILS).format(location=location),
+                rng.choice(STORY_CLOSINGS)
+            ])
+            return json.dumps({
+                "narrative": narrative,
+                "suggested_actions": rng.sample(STORY_ACTIONS, 3),
+                "context_used": [],
+                "tone": rng.choice(TONES)
+            })
+        
+        return rng.choice(STORY_CLOSINGS)
+    
+    def _usage(self, messages: List[BaseMessage], content: str) -> Dict[str, int]:
+        input_tokens = sum(len(tokenize(str(m.content))) for m in messages)
+        output_tokens = len(tokenize(content))
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        }
+    
+    def _token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+    
+    def _result(self, messages: List[BaseMessage], content: str) -> ChatResult:
+        message = AIMessage(
+            content=content,
+            usage_metadata=self._usage(messages, content),
+            response_metadata={"model_name": self.model_name}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        content = self._build_response(messages)
+        time.sleep(self.latency_ms / 1000.0 + self._token_delay() * len(tokenize(content)))
+        return self._result(messages, content)
+    
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        content = self._build_response(messages)
+        await asyncio.sleep(self.latency_ms / 1000.0 + self._token_delay() * len(tokenize(content)))
+        return self._result(messages, content)
+    
+    def _chunks(self, messages: List[BaseMessage], content: str) -> List[ChatGenerationChunk]:
+        tokens = tokenize(content)
+        chunks = []
+        for i, token in enumerate(tokens):
+            usage = self._usage(messages, content) if i == len(tokens) - 1 else None
+            chunks.append(ChatGenerationChunk(message=AIMessageChunk(
+                content=token,
+                usage_metadata=usage,
+                response_metadata={"model_name": self.model_name} if usage else {}
+            )))
+        return chunks
+    
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        content = self._build_response(messages)
+        time.sleep(self.latency_ms / 1000.0)
+        
+        for chunk in self._chunks(messages, content):
+            time.sleep(self._token_delay())
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+    
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        content = self._build_response(messages)
+        await asyncio.sleep(self.latency_ms / 1000.0)
+        
+        for chunk in self._chunks(messages, content):
+            await asyncio.sleep(self._token_delay())
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
@@ -0,0 +1,331 @@
+import asyncio
+import contextvars
+import json
+import math
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Callable
+
+from src.config import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_VARIETY,
+    RESPONSE_CACHE_SEMANTIC,
+    RESPONSE_CACHE_SIMILARITY
+)
+
+
+FILLER_WORDS = {"a", "an", "the", "please", "some"}
+TOUCH_FLUSH_EVERY = 32
+
+_deferred_writes: contextvars.ContextVar = contextvars.ContextVar("deferred_cache_writes", default=None)
+
+
+def defer_cache_writes() -> List[tuple]:
+    deferred: List[tuple] = []
+    _deferred_writes.set(deferred)
+    return deferred
+
+
+def normalize_action(action: str) -> str:
+    words = re.sub(r"[^a-z0-9\s]", " ", action.lower()).split()
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class CacheEntry:
+    
+    def __init__(self, scope: str, action: str, variants: List[str], created_at: float,
+                 embedding: Optional[List[float]] = None):
+        self.scope = scope
+        self.action = action
+        self.variants = variants
+        self.created_at = created_at
+        self.embedding = embedding
+
+
+class ResponseCache:
+    
+    def __init__(
+        self,
+        path=RESPONSE_CACHE_PATH,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: float = RESPONSE_CACHE_TTL,
+        variety: int = RESPONSE_CACHE_VARIETY,
+        semantic: bool = RESPONSE_CACHE_SEMANTIC,
+        similarity_threshold: float = RESPONSE_CACHE_SIMILARITY,
+        embed_fn: Optional[Callable[[str], List[float]]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.variety = max(1, variety)
+        self.semantic = semantic
+        self.similarity_threshold = similarity_threshold
+        self._embed_fn = embed_fn
+        
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._scopes: Dict[str, set] = {}
+        self._lock = threading.RLock()
+        self._random = random.Random()
+        self._touched: Dict[str, float] = {}
+        
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, scope TEXT, action TEXT, variants TEXT, "
+                "embedding TEXT, created_at REAL, last_used REAL)"
+            )
+            self._conn.commit()
+            self._load()
+    
+    def _load(self):
+        cutoff = time.time() - self.ttl
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+        self._conn.commit()
+        
+        rows = self._conn.execute(
+            "SELECT key, scope, action, variants, embedding, created_at FROM responses "
+            "ORDER BY last_used DESC LIMIT ?",
+            (self.max_entries,)
+        ).fetchall()
+        
+        for key, scope, action, variants, embedding, created_at in reversed(rows):
+            entry = CacheEntry(
+                scope=scope,
+                action=action,
+                variants=json.loads(variants),
+                created_at=created_at,
+                embedding=json.loads(embedding) if embedding else None
+            )
+            self._entries[key] = entry
+            self._scopes.setdefault(scope, set()).add(key)
+    
+    def _embed(self, text: str) -> Optional[List[float]]:
+        if not self.semantic:
+            return None
+        if self._embed_fn is None:
+            from src.rag.vector_store import get_vector_store
+            self._embed_fn = get_vector_store().embed_query
+        try:
+            return list(self._embed_fn(text))
+        except Exception as e:
+            print(f"Response cache embedding error: {e}")
+            return None
+    
+    @staticmethod
+    def make_scope(node: str, location: str, npc: Optional[str] = None,
+                   relationship_band: Optional[str] = None, player: Optional[str] = None) -> str:
+        return "|".join([node, location, npc or "", relationship_band or "", player or ""])
+    
+    def _remove(self, key: str):
+        self._touched.pop(key, None)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._scopes.get(entry.scope, set()).discard(key)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+    
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.created_at > self.ttl
+    
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._is_expired(entry):
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    def _semantic_lookup(self, scope: str, action: str) -> Optional[str]:
+        embedding = self._embed(action)
+        if embedding is None:
+            return None
+        
+        best_key, best_score = None, self.similarity_threshold
+        for key in list(self._scopes.get(scope, ())):
+            entry = self._entries[key]
+            if entry.embedding is None or len(entry.variants) < self.variety:
+                continue
+            score = cosine_similarity(embedding, entry.embedding)
+            if score >= best_score:
+                best_key, best_score = key, score
+        
+        return best_key if best_key and self._lookup(best_key) else None
+    
+    def get(self, node: str, location: str, action: str, npc: Optional[str] = None,
+            relationship_band: Optional[str] = None, player: Optional[str] = None) -> Optional[str]:
+        if not RESPONSE_CACHE_ENABLED:
+            return None
+        
+        scope = self.make_scope(node, location, npc, relationship_band, player)
+        normalized = normalize_action(action)
+        key = f"{scope}|{normalized}"
+        
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and len(entry.variants) >= self.variety:
+                self.hits += 1
+                self._touch(key)
+                return self._random.choice(entry.variants)
+            
+            if entry is None and self.semantic:
+                similar = self._semantic_lookup(scope, normalized)
+                if similar is not None:
+                    self.semantic_hits += 1
+                    self._touch(similar)
+                    return self._random.choice(self._entries[similar].variants)
+            
+            self.misses += 1
+            return None
+    
+    def put(self, node: str, location: str, action: str, content: str, npc: Optional[str] = None,
+            relationship_band: Optional[str] = None, player: Optional[str] = None):
+        if not RESPONSE_CACHE_ENABLED or not content:
+            return
+        
+        deferred = _deferred_writes.get()
+        if deferred is not None:
+            deferred.append((node, location, action, content, npc, relationship_band, player))
+            return
+        
+        scope = self.make_scope(node, location, npc, relationship_band, player)
+        normalized = normalize_action(action)
+        key = f"{scope}|{normalized}"
+        
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                entry = CacheEntry(
+                    scope=scope,
+                    action=normalized,
+                    variants=[],
+                    created_at=time.time(),
+                    embedding=self._embed(normalized)
+                )
+                self._entries[key] = entry
+                self._scopes.setdefault(scope, set()).add(key)
+            
+            if content not in entry.variants and len(entry.variants) < self.variety:
+                entry.variants.append(content)
+            
+            self._persist(key, entry)
+            
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    async def aget(self, node: str, location: str, action: str, npc: Optional[str] = None,
+                   relationship_band: Optional[str] = None, player: Optional[str] = None) -> Optional[str]:
+        return await asyncio.to_thread(self.get, node, location, action, npc, relationship_band, player)
+    
+    async def aput(self, node: str, location: str, action: str, content: str, npc: Optional[str] = None,
+                   relationship_band: Optional[str] = None, player: Optional[str] = None):
+        await asyncio.to_thread(self.put, node, location, action, content, npc, relationship_band, player)
+    
+    def promote(self, deferred: List[tuple]):
+        for write in deferred:
+            self.put(*write)
+    
+    async def apromote(self, deferred: List[tuple]):
+        await asyncio.to_thread(self.promote, deferred)
+    
+    def _persist(self, key: str, entry: CacheEntry):
+        if self._conn is None:
+            return
+        self._touched.pop(key, None)
+        self._flush_touches()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, scope, action, variants, embedding, created_at, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                entry.scope,
+                entry.action,
+                json.dumps(entry.variants),
+                json.dumps(entry.embedding) if entry.embedding else None,
+                entry.created_at,
+                time.time()
+            )
+        )
+        self._conn.commit()
+    
+    def _touch(self, key: str):
+        if self._conn is None:
+            return
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_FLUSH_EVERY:
+            self._flush_touches()
+            self._conn.commit()
+    
+    def _flush_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()]
+            )
+            self._touched.clear()
+    
+    def flush(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touches()
+                self._conn.commit()
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+            self._touched.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.semantic_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0
+            }
+
+
+_response_cache_instance: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache_instance
+    if _response_cache_instance is None:
+        with _response_cache_lock:
+            if _response_cache_instance is None:
+                _response_cache_instance = ResponseCache()
+    return _response_cache_instance
@@ -4,7 +4,11 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.game_engine import GameEngine
+from src.utils.warmup import get_startup_profiler
+
+with get_startup_profiler().measure("import src.game_engine"):
+    from src.game_engine import GameEngine
+from src.config import STREAM_OUTPUT, FAST_START, STARTUP_PROFILE, SAVES_PER_PAGE
 from src.utils.display import *
 
 
@@ -31,6 +35,7 @@ def show_main_menu(engine: GameEngine):
         load_game_menu(engine)
     elif choice == "4":
         print_info("Thanks for playing! Goodbye!")
+        engine.shutdown()
         sys.exit(0)
     else:
         print_error("Invalid choice. Please try again.")
@@ -53,6 +58,10 @@ def start_new_game(engine: GameEngine):
 def continue_game(engine: GameEngine):
     from src.persistence.save_manager import get_last_save
     
+    if engine.resume_last_session() is not None:
+        game_loop(engine)
+        return
+    
     last_save = get_last_save()
     
     if last_save:
@@ -69,10 +78,13 @@ def continue_game(engine: GameEngine):
         show_main_menu(engine)
 
 
-def load_game_menu(engine: GameEngine):
+def load_game_menu(engine: GameEngine, page: int = 0):
     print_header("Load Game")
     
-    saves = engine.list_available_saves()
+    total = engine.count_available_saves()
+    pages = max(1, (total + SAVES_PER_PAGE - 1) // SAVES_PER_PAGE)
+    page = min(max(page, 0), pages - 1)
+    saves = engine.list_available_saves(page * SAVES_PER_PAGE, SAVES_PER_PAGE)
     
     if not saves:
         print_error("No saved games found.")
@@ -80,16 +92,25 @@ def load_game_menu(engine: GameEngine):
         show_main_menu(engine)
         return
     
-    print(f"{Fore.CYAN}Available saves:{Style.RESET_ALL}\n")
+    print(f"{Fore.CYAN}Available saves (page {page + 1}/{pages}, {total} total):{Style.RESET_ALL}\n")
     for i, save in enumerate(saves, 1):
         print(f"  {i}. {save['player_name']} - Level {save['level']} - {save['location']}")
         print(f"     {Fore.YELLOW}Saved: {save['last_save_time']}{Style.RESET_ALL}\n")
     
-    choice = input(f"{Fore.CYAN}Select a save (1-{len(saves)}) or 'b' to go back: {Style.RESET_ALL}").strip()
+    options = ["'b' to go back"]
+    if page + 1 < pages:
+        options.append("'n' for next page")
+    if page > 0:
+        options.append("'p' for previous page")
+    
+    choice = input(f"{Fore.CYAN}Select a save (1-{len(saves)}), {', '.join(options)}: {Style.RESET_ALL}").strip()
     
     if choice.lower() == 'b':
         show_main_menu(engine)
         return
+    if choice.lower() in ('n', 'p'):
+        load_game_menu(engine, page + (1 if choice.lower() == 'n' else -1))
+        return
     
     try:
         index = int(choice) - 1
@@ -99,11 +120,11 @@ def load_game_menu(engine: GameEngine):
         else:
             print_error("Invalid selection.")
             input("Press Enter to try again...")
-            load_game_menu(engine)
+            load_game_menu(engine, page)
     except ValueError:
         print_error("Invalid input.")
         input("Press Enter to try again...")
-        load_game_menu(engine)
+        load_game_menu(engine, page)
 
 
 def game_loop(engine: GameEngine):
@@ -124,8 +145,9 @@ def game_loop(engine: GameEngine):
         
         print_status_bar(state)
         
-        if state["last_output"]:
+        if state["last_output"] and not engine.last_output_streamed:
             print_narrative(state["last_output"])
+        engine.last_output_streamed = False
         
         print(f"{Fore.MAGENTA}Commands: 'save' to save, 'quit' to return to menu, 'help' for help{Style.RESET_ALL}")
         action = input(f"\n{Fore.GREEN}> {Style.RESET_ALL}").strip()
@@ -148,13 +170,22 @@ def game_loop(engine: GameEngine):
             show_help()
             continue
         
-        elif action.lower() in ["status", "stats"]:
+        elif action.lower() == "status":
             show_detailed_status(state)
             continue
         
+        elif action.lower() == "stats":
+            show_performance_stats(engine)
+            continue
+        
         print_info("\nProcessing...")
         try:
-            result = engine.process_action(action)
+            if STREAM_OUTPUT:
+                result = engine.process_action(action, on_token=print_stream_token)
+                if engine.last_output_streamed:
+                    end_stream()
+            else:
+                result = engine.process_action(action)
         except Exception as e:
             print_error(f"Error: {e}")
             input("Press Enter to continue...")
@@ -181,6 +212,7 @@ def show_help():
     - quit: Return to main menu
     - help: Show this help
     - status: Show detailed character status
+    - stats: Show performance statistics
     
     TIPS:
     - Pay attention to NPC dialogue for quest hints
@@ -223,16 +255,82 @@ def show_detailed_status(state: dict):
     input("\nPress Enter to continue...")
 
 
+def show_performance_stats(engine: GameEngine):
+    print_header("Performance Stats")
+    
+    stats = engine.get_performance_stats()
+    
+    print(f"{Fore.YELLOW}Timings and tokens:{Style.RESET_ALL}")
+    print(f"  {'metric':<36} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, summary in stats["histograms"].items():
+        print(f"  {name:<36} {summary['count']:>6} {summary['p50']:>9.1f} {summary['p95']:>9.1f} {summary['p99']:>9.1f}")
+    
+    print(f"\n{Fore.YELLOW}Counters:{Style.RESET_ALL}")
+    for name, value in stats["counters"].items():
+        print(f"  {name:<36} {value:>10.4g}")
+    
+    pool = stats["llm_pool"]
+    print(f"\n{Fore.YELLOW}LLM client pool:{Style.RESET_ALL} {pool['clients']} clients, "
+          f"{pool['hits']} hits, {pool['misses']} misses")
+    
+    cache = stats["response_cache"]
+    print(f"{Fore.YELLOW}Response cache:{Style.RESET_ALL} {cache['entries']} entries, "
+          f"hit rate {cache['hit_rate']:.0%}")
+    
+    if "query_embeddings" in stats:
+        queries = stats["query_embeddings"]
+        print(f"{Fore.YELLOW}Query embeddings:{Style.RESET_ALL} {queries['precomputed_queries']} precomputed, "
+              f"{queries['cached_queries']} cached, hit rate {queries['hit_rate']:.0%}")
+    
+    if "semantic_router" in stats:
+        router = stats["semantic_router"]
+        print(f"{Fore.YELLOW}Semantic router:{Style.RESET_ALL} {router['routed']} routed, "
+              f"{router['below_threshold']} below threshold, cache hit rate {router['hit_rate']:.0%}")
+    
+    if "journal" in stats:
+        journal = stats["journal"]
+        print(f"{Fore.YELLOW}Turn journal:{Style.RESET_ALL} {journal['entries']} entries ({journal['bytes']:,} bytes), "
+              f"{journal['snapshots']} snapshots, {journal['compactions']} compactions")
+    
+    export = input(f"\n{Fore.CYAN}Export turn metrics to JSONL? Enter a path or press Enter to skip: {Style.RESET_ALL}").strip()
+    if export:
+        from src.utils.metrics import get_metrics
+        count = get_metrics().export_jsonl(export)
+        print_success(f"Exported {count} turns to {export}")
+
+
+def show_startup_profile(engine: GameEngine):
+    print_header("Startup Profile")
+    
+    if engine.warmup is not None:
+        print_info("Waiting for background warm-up to finish...")
+        engine.wait_until_ready()
+        for error in engine.warmup.errors:
+            print_error(error)
+    
+    print(get_startup_profiler().report())
+    input("\nPress Enter to continue...")
+
+
 def main():
     try:
         engine = GameEngine()
         
-        engine.initialize_rag_system()
+        if FAST_START:
+            engine.start_background_warmup()
+        else:
+            engine.initialize_rag_system()
+        
+        get_startup_profiler().mark("main menu ready")
+        
+        if STARTUP_PROFILE or "--profile-startup" in sys.argv:
+            show_startup_profile(engine)
         
         show_main_menu(engine)
     
     except KeyboardInterrupt:
         print_info("\n\nGame interrupted. Goodbye!")
+        engine.shutdown()
         sys.exit(0)
     except Exception as e:
         print_error(f"Fatal error: {e}")
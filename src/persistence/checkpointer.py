@@ -0,0 +1,217 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import (
+    CHECKPOINT_DB_PATH,
+    CHECKPOINT_KEEP,
+    CHECKPOINT_MAX_SESSIONS,
+    CHECKPOINT_PRUNE_EVERY
+)
+from src.game_state import GameState, create_initial_state
+
+
+SESSIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    player_name TEXT,
+    location TEXT,
+    level INTEGER,
+    turn_count INTEGER,
+    updated_at TEXT
+)
+"""
+
+UPSERT_SESSION = """
+INSERT INTO sessions (session_id, player_name, location, level, turn_count, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(session_id) DO UPDATE SET
+    player_name = excluded.player_name,
+    location = excluded.location,
+    level = excluded.level,
+    turn_count = excluded.turn_count,
+    updated_at = excluded.updated_at
+"""
+
+PRUNE_CHECKPOINTS = """
+DELETE FROM checkpoints WHERE rowid IN (
+    SELECT rowid FROM (
+        SELECT rowid, ROW_NUMBER() OVER (
+            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+        ) AS position
+        FROM checkpoints
+    ) WHERE position > ?
+)
+"""
+
+PRUNE_WRITES = """
+DELETE FROM writes WHERE NOT EXISTS (
+    SELECT 1 FROM checkpoints c
+    WHERE c.thread_id = writes.thread_id
+      AND c.checkpoint_ns = writes.checkpoint_ns
+      AND c.checkpoint_id = writes.checkpoint_id
+)
+"""
+
+
+def session_config(session_id: str) -> Dict:
+    return {"configurable": {"thread_id": session_id}}
+
+
+def session_row(thread_id: str, values: Dict) -> Optional[tuple]:
+    if "player_name" not in values:
+        return None
+    return (
+        thread_id,
+        values["player_name"],
+        values.get("current_location"),
+        values.get("level"),
+        values.get("turn_count"),
+        datetime.now().isoformat()
+    )
+
+
+def create_session_saver(conn):
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    
+    class SessionSqliteSaver(AsyncSqliteSaver):
+        
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            saved = await super().aput(config, checkpoint, metadata, new_versions)
+            
+            configurable = saved["configurable"]
+            if configurable.get("checkpoint_ns"):
+                return saved
+            
+            row = session_row(str(configurable["thread_id"]), checkpoint.get("channel_values", {}))
+            if row is not None:
+                async with self.lock:
+                    await self.conn.execute(UPSERT_SESSION, row)
+                    await self.conn.commit()
+            return saved
+    
+    return SessionSqliteSaver(conn)
+
+
+class GameCheckpointer:
+    
+    def __init__(
+        self,
+        path: Path = CHECKPOINT_DB_PATH,
+        keep: int = CHECKPOINT_KEEP,
+        max_sessions: int = CHECKPOINT_MAX_SESSIONS,
+        prune_every: int = CHECKPOINT_PRUNE_EVERY
+    ):
+        self.path = Path(path)
+        self.keep = max(1, keep)
+        self.max_sessions = max(1, max_sessions)
+        self.prune_every = max(1, prune_every)
+        
+        self.saver = None
+        self.graph = None
+        self._setup_lock = asyncio.Lock()
+        self.stats = {"checkpoints": 0, "pruned": 0}
+    
+    async def asetup(self):
+        if self.saver is not None:
+            return
+        
+        async with self._setup_lock:
+            if self.saver is not None:
+                return
+            
+            import aiosqlite
+            from src.graph.graph import create_game_graph
+            
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = await aiosqlite.connect(str(self.path))
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute(SESSIONS_SCHEMA)
+            await conn.commit()
+            
+            saver = create_session_saver(conn)
+            await saver.setup()
+            
+            self.graph = create_game_graph(checkpointer=saver)
+            self.saver = saver
+    
+    async def apersist(self, state: GameState, checkpointed: bool = False):
+        await self.asetup()
+        
+        if not checkpointed:
+            await self.graph.aupdate_state(session_config(state["session_id"]), dict(state), as_node="state_update")
+        self.stats["checkpoints"] += 1
+        
+        if self.stats["checkpoints"] % self.prune_every == 0:
+            await self.aprune()
+    
+    async def alist_sessions(self, limit: int = 10) -> List[Dict]:
+        await self.asetup()
+        
+        async with self.saver.lock:
+            async with self.saver.conn.execute(
+                "SELECT session_id, player_name, location, level, turn_count, updated_at "
+                "FROM sessions ORDER BY updated_at DESC LIMIT ?",
+                (limit,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        
+        columns = ["session_id", "player_name", "location", "level", "turn_count", "updated_at"]
+        return [dict(zip(columns, row)) for row in rows]
+    
+    async def aresume(self, session_id: Optional[str] = None) -> Optional[GameState]:
+        await self.asetup()
+        
+        if session_id is None:
+            sessions = await self.alist_sessions(limit=1)
+            if not sessions:
+                return None
+            session_id = sessions[0]["session_id"]
+        
+        snapshot = await self.graph.aget_state(session_config(session_id))
+        if not snapshot.values:
+            return None
+        
+        values = dict(snapshot.values)
+        state = GameState(**{**create_initial_state(values.get("player_name", "Adventurer")), **values})
+        state["session_id"] = session_id
+        return state
+    
+    async def aprune(self):
+        await self.asetup()
+        
+        async with self.saver.lock:
+            conn = self.saver.conn
+            async with conn.execute(
+                "SELECT session_id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                (self.max_sessions,)
+            ) as cursor:
+                stale = [row[0] for row in await cursor.fetchall()]
+            
+            for session_id in stale:
+                await conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (session_id,))
+                await conn.execute("DELETE FROM writes WHERE thread_id = ?", (session_id,))
+                await conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            
+            cursor = await conn.execute(PRUNE_CHECKPOINTS, (self.keep,))
+            self.stats["pruned"] += max(cursor.rowcount, 0)
+            await conn.execute(PRUNE_WRITES)
+            await conn.commit()
+    
+    async def aclose(self):
+        if self.saver is not None:
+            await self.saver.conn.close()
+            self.saver = None
+            self.graph = None
+
+
+_checkpointer_instance: Optional[GameCheckpointer] = None
+
+
+def get_checkpointer() -> GameCheckpointer:
+    global _checkpointer_instance
+    if _checkpointer_instance is None:
+        _checkpointer_instance = GameCheckpointer()
+    return _checkpointer_instance
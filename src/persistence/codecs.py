@@ -0,0 +1,175 @@
+import json
+import struct
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+SCHEMA_VERSION = 2
+
+MAGIC = b"RPGS"
+HEADER = struct.Struct(">4sBH")
+
+SERIALIZERS = ("msgpack", "json")
+COMPRESSORS = ("zstd", "zlib")
+
+
+def _add_session_fields(state: Dict) -> Dict:
+    import uuid
+    state.setdefault("session_id", uuid.uuid4().hex)
+    state.setdefault("parsed_action", None)
+    return state
+
+
+MIGRATIONS: Dict[int, Callable[[Dict], Dict]] = {
+    1: _add_session_fields
+}
+
+
+def register_migration(from_version: int, migration: Callable[[Dict], Dict]):
+    MIGRATIONS[from_version] = migration
+
+
+def migrate(state: Dict, version: int) -> Dict:
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Save schema version {version} is newer than supported version {SCHEMA_VERSION}")
+    
+    while version < SCHEMA_VERSION:
+        if version not in MIGRATIONS:
+            raise ValueError(f"No migration from save schema version {version}")
+        state = MIGRATIONS[version](state)
+        version += 1
+    return state
+
+
+class SaveCodec:
+    
+    name = "base"
+    extension = ".sav"
+    
+    def encode(self, state: Dict) -> bytes:
+        raise NotImplementedError
+    
+    def decode(self, data: bytes) -> Tuple[Dict, int]:
+        raise NotImplementedError
+
+
+class JsonCodec(SaveCodec):
+    
+    name = "json"
+    extension = ".json"
+    
+    def __init__(self, indent: Optional[int] = 2):
+        self.indent = indent
+    
+    def encode(self, state: Dict) -> bytes:
+        payload = dict(state, schema_version=SCHEMA_VERSION)
+        return json.dumps(payload, indent=self.indent).encode("utf-8")
+    
+    def decode(self, data: bytes) -> Tuple[Dict, int]:
+        state = json.loads(data.decode("utf-8"))
+        return state, state.pop("schema_version", 1)
+
+
+class CompactCodec(SaveCodec):
+    
+    name = "compact"
+    extension = ".sav"
+    
+    def __init__(self, serializer: Optional[str] = None, compressor: Optional[str] = None, level: int = 3):
+        self.serializer = serializer or ("msgpack" if msgpack is not None else "json")
+        self.compressor = compressor or ("zstd" if zstandard is not None else "zlib")
+        self.level = level
+        
+        if self.serializer not in SERIALIZERS or self.compressor not in COMPRESSORS:
+            raise ValueError(f"Unknown compact codec {self.serializer}+{self.compressor}")
+        _require(self.serializer, self.compressor)
+    
+    @property
+    def codec_id(self) -> int:
+        return SERIALIZERS.index(self.serializer) * len(COMPRESSORS) + COMPRESSORS.index(self.compressor) + 1
+    
+    def encode(self, state: Dict) -> bytes:
+        if self.serializer == "msgpack":
+            body = msgpack.packb(state, use_bin_type=True)
+        else:
+            body = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        
+        if self.compressor == "zstd":
+            body = zstandard.ZstdCompressor(level=self.level).compress(body)
+        else:
+            body = zlib.compress(body, self.level)
+        
+        return HEADER.pack(MAGIC, self.codec_id, SCHEMA_VERSION) + body
+    
+    def decode(self, data: bytes) -> Tuple[Dict, int]:
+        magic, codec_id, version = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a compact save file")
+        
+        serializer, compressor = _codec_parts(codec_id)
+        _require(serializer, compressor)
+        body = data[HEADER.size:]
+        
+        if compressor == "zstd":
+            body = zstandard.ZstdDecompressor().decompress(body)
+        else:
+            body = zlib.decompress(body)
+        
+        if serializer == "msgpack":
+            state = msgpack.unpackb(body, raw=False)
+        else:
+            state = json.loads(body.decode("utf-8"))
+        return state, version
+
+
+def _codec_parts(codec_id: int) -> Tuple[str, str]:
+    index = codec_id - 1
+    if not 0 <= index < len(SERIALIZERS) * len(COMPRESSORS):
+        raise ValueError(f"Unknown compact codec id {codec_id}")
+    return SERIALIZERS[index // len(COMPRESSORS)], COMPRESSORS[index % len(COMPRESSORS)]
+
+
+def _require(serializer: str, compressor: str):
+    if serializer == "msgpack" and msgpack is None:
+        raise ImportError("msgpack is required for this save file (pip install msgpack)")
+    if compressor == "zstd" and zstandard is None:
+        raise ImportError("zstandard is required for this save file (pip install zstandard)")
+
+
+CODECS: Dict[str, Callable[[], SaveCodec]] = {
+    "json": JsonCodec,
+    "compact": CompactCodec
+}
+
+
+def get_codec(name: str) -> SaveCodec:
+    if name not in CODECS:
+        raise ValueError(f"Unknown save format '{name}'. Choose from: {', '.join(CODECS)}")
+    return CODECS[name]()
+
+
+def save_extensions() -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(factory.extension for factory in CODECS.values()))
+
+
+def detect_codec(data: bytes) -> SaveCodec:
+    if data.startswith(MAGIC):
+        return CompactCodec(*_codec_parts(HEADER.unpack_from(data)[1]))
+    if data.lstrip()[:1] == b"{":
+        return JsonCodec()
+    raise ValueError("Unrecognized save file format")
+
+
+def decode_state(data: bytes) -> Dict:
+    state, version = detect_codec(data).decode(data)
+    return migrate(state, version)
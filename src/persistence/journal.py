@@ -0,0 +1,255 @@
+import copy
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.config import (
+    JOURNAL_DIRECTORY,
+    JOURNAL_FSYNC,
+    JOURNAL_MAX_SESSIONS,
+    JOURNAL_SNAPSHOT_EVERY
+)
+from src.game_state import GameState, create_initial_state
+
+
+def journal_entry(seq: int, previous: Dict, current: Dict) -> Optional[Dict]:
+    changed, appended = {}, {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if old == value:
+            continue
+        if isinstance(old, list) and isinstance(value, list) and len(value) > len(old) and value[:len(old)] == old:
+            appended[key] = value[len(old):]
+        else:
+            changed[key] = value
+    removed = [key for key in previous if key not in current]
+    
+    if not changed and not appended and not removed:
+        return None
+    
+    entry = {"seq": seq}
+    if changed:
+        entry["set"] = changed
+    if appended:
+        entry["append"] = appended
+    if removed:
+        entry["del"] = removed
+    return entry
+
+
+def apply_entry(state: Dict, entry: Dict) -> Dict:
+    state.update(entry.get("set", {}))
+    for key, tail in entry.get("append", {}).items():
+        state[key] = list(state.get(key) or []) + tail
+    for key in entry.get("del", []):
+        state.pop(key, None)
+    return state
+
+
+def encode_line(entry: Dict) -> bytes:
+    payload = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def decode_line(line: bytes) -> Optional[Dict]:
+    if len(line) < 10 or not line.endswith(b"\n") or line[8:9] != b" ":
+        return None
+    payload = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _write_atomic(path: Path, data: bytes, fsync: bool):
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class TurnJournal:
+    
+    def __init__(
+        self,
+        directory: Path = JOURNAL_DIRECTORY,
+        snapshot_every: int = JOURNAL_SNAPSHOT_EVERY,
+        fsync: bool = JOURNAL_FSYNC,
+        max_sessions: int = JOURNAL_MAX_SESSIONS
+    ):
+        self.directory = Path(directory)
+        self.snapshot_every = max(1, snapshot_every)
+        self.fsync = fsync
+        self.max_sessions = max(1, max_sessions)
+        
+        self._lock = threading.RLock()
+        self._sessions: Dict[str, Dict] = {}
+        self._compactor: Optional[threading.Thread] = None
+        self.stats = {"entries": 0, "bytes": 0, "snapshots": 0, "compactions": 0, "recovered_entries": 0}
+    
+    def _paths(self, session_id: str) -> Tuple[Path, Path]:
+        return self.directory / f"{session_id}.snapshot.json", self.directory / f"{session_id}.log"
+    
+    def _write_snapshot(self, session_id: str, state: Dict, seq: int):
+        snapshot_path, _ = self._paths(session_id)
+        data = json.dumps({"seq": seq, "state": state}, separators=(",", ":")).encode("utf-8")
+        _write_atomic(snapshot_path, data, self.fsync)
+        self.stats["snapshots"] += 1
+    
+    def _start_session(self, state: GameState):
+        session_id = state["session_id"]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        current = copy.deepcopy(dict(state))
+        self._write_snapshot(session_id, current, 0)
+        self._paths(session_id)[1].unlink(missing_ok=True)
+        self._sessions[session_id] = {"state": current, "seq": 0, "snapshot_seq": 0}
+        self.prune()
+    
+    def append(self, state: GameState):
+        with self._lock:
+            session = self._sessions.get(state["session_id"])
+            if session is None:
+                self._start_session(state)
+                return
+            
+            current = copy.deepcopy(dict(state))
+            entry = journal_entry(session["seq"] + 1, session["state"], current)
+            if entry is None:
+                return
+            
+            line = encode_line(entry)
+            with open(self._paths(state["session_id"])[1], "ab") as f:
+                f.write(line)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            
+            session["state"] = current
+            session["seq"] = entry["seq"]
+            self.stats["entries"] += 1
+            self.stats["bytes"] += len(line)
+            
+            if session["seq"] - session["snapshot_seq"] >= self.snapshot_every:
+                self._schedule_compaction(state["session_id"], current, session["seq"])
+    
+    def _schedule_compaction(self, session_id: str, state: Dict, seq: int):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        
+        self._sessions[session_id]["snapshot_seq"] = seq
+        self._compactor = threading.Thread(
+            target=self.compact,
+            args=(session_id, state, seq),
+            name="journal-compactor",
+            daemon=True
+        )
+        self._compactor.start()
+    
+    def compact(self, session_id: str, state: Dict, seq: int):
+        try:
+            with self._lock:
+                self._write_snapshot(session_id, state, seq)
+                
+                log_path = self._paths(session_id)[1]
+                if log_path.exists():
+                    with open(log_path, "rb") as f:
+                        kept = [line for line in f if (decode_line(line) or {}).get("seq", 0) > seq]
+                    _write_atomic(log_path, b"".join(kept), self.fsync)
+                self.stats["compactions"] += 1
+        except Exception as e:
+            print(f"Error compacting journal {session_id}: {e}")
+    
+    def latest_session(self) -> Optional[str]:
+        if not self.directory.exists():
+            return None
+        
+        latest = {}
+        for path in self.directory.glob("*.snapshot.json"):
+            session_id = path.name[:-len(".snapshot.json")]
+            mtimes = [p.stat().st_mtime for p in self._paths(session_id) if p.exists()]
+            latest[session_id] = max(mtimes)
+        return max(latest, key=latest.get) if latest else None
+    
+    def recover(self, session_id: Optional[str] = None) -> Optional[GameState]:
+        with self._lock:
+            session_id = session_id or self.latest_session()
+            if session_id is None:
+                return None
+            
+            snapshot_path, log_path = self._paths(session_id)
+            if not snapshot_path.exists():
+                return None
+            
+            try:
+                with open(snapshot_path, "r") as f:
+                    snapshot = json.load(f)
+            except Exception as e:
+                print(f"Error reading journal snapshot {snapshot_path}: {e}")
+                return None
+            
+            state, seq = snapshot["state"], snapshot["seq"]
+            snapshot_seq = seq
+            
+            if log_path.exists():
+                good_bytes = 0
+                with open(log_path, "rb") as f:
+                    for line in f:
+                        entry = decode_line(line)
+                        if entry is None or entry["seq"] > seq + 1:
+                            break
+                        if entry["seq"] == seq + 1:
+                            state = apply_entry(state, entry)
+                            seq = entry["seq"]
+                            self.stats["recovered_entries"] += 1
+                        good_bytes += len(line)
+                
+                if good_bytes < log_path.stat().st_size:
+                    print(f"Discarding torn journal tail in {log_path}")
+                    with open(log_path, "r+b") as f:
+                        f.truncate(good_bytes)
+            
+            recovered = GameState(**{**create_initial_state(state.get("player_name", "Adventurer")), **state})
+            recovered["session_id"] = session_id
+            self._sessions[session_id] = {
+                "state": copy.deepcopy(dict(recovered)),
+                "seq": seq,
+                "snapshot_seq": snapshot_seq
+            }
+            return recovered
+    
+    def prune(self):
+        snapshots = sorted(
+            self.directory.glob("*.snapshot.json"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True
+        )
+        for path in snapshots[self.max_sessions:]:
+            session_id = path.name[:-len(".snapshot.json")]
+            if session_id in self._sessions:
+                continue
+            for stale in self._paths(session_id):
+                stale.unlink(missing_ok=True)
+    
+    def close(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+
+_journal_instance: Optional[TurnJournal] = None
+
+
+def get_journal() -> TurnJournal:
+    global _journal_instance
+    if _journal_instance is None:
+        _journal_instance = TurnJournal()
+    return _journal_instance
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import SAVE_DIRECTORY
+from src.persistence.codecs import decode_state, save_extensions
+
+
+MANIFEST_NAME = "manifest.sqlite"
+COLUMNS = ["filename", "player_name", "last_save_time", "location", "level"]
+
+
+def _directory_mtime(directory: Path) -> int:
+    try:
+        return directory.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+class SaveManifest:
+    
+    def __init__(self, directory: Path = SAVE_DIRECTORY):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        
+        self._conn = sqlite3.connect(str(self.directory / MANIFEST_NAME), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=MEMORY")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS slots ("
+            "filename TEXT PRIMARY KEY, player_name TEXT, last_save_time TEXT, location TEXT, "
+            "level INTEGER, mtime_ns INTEGER, size INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS slots_by_time ON slots (last_save_time DESC)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        self._conn.commit()
+    
+    def _stored_mtime(self) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'directory_mtime'").fetchone()
+        return row[0] if row else None
+    
+    def _mark_fresh(self):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('directory_mtime', ?)",
+            (_directory_mtime(self.directory),)
+        )
+    
+    def _upsert(self, filename: str, state: Dict, stat: os.stat_result):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO slots VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                filename,
+                state.get("player_name", "Unknown"),
+                state.get("last_save_time") or "Unknown",
+                state.get("current_location", "Unknown"),
+                state.get("level", 1),
+                stat.st_mtime_ns,
+                stat.st_size
+            )
+        )
+    
+    def directory_mtime(self) -> int:
+        return _directory_mtime(self.directory)
+    
+    def is_stale(self) -> bool:
+        return self._stored_mtime() != self.directory_mtime()
+    
+    def refresh(self, force: bool = False):
+        with self._lock:
+            if not force and not self.is_stale():
+                return
+            
+            known = {
+                filename: (mtime_ns, size)
+                for filename, mtime_ns, size in self._conn.execute("SELECT filename, mtime_ns, size FROM slots")
+            }
+            seen = set()
+            
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(save_extensions()) or not entry.is_file():
+                    continue
+                
+                stat = entry.stat()
+                seen.add(entry.name)
+                if known.get(entry.name) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                
+                try:
+                    with open(entry.path, "rb") as f:
+                        self._upsert(entry.name, decode_state(f.read()), stat)
+                except Exception as e:
+                    print(f"Error reading save file {entry.path}: {e}")
+            
+            removed = [(filename,) for filename in known if filename not in seen]
+            self._conn.executemany("DELETE FROM slots WHERE filename = ?", removed)
+            self._mark_fresh()
+            self._conn.commit()
+    
+    def record(self, filepath: Path, state: Dict, mtime_before: Optional[int] = None):
+        with self._lock:
+            self._upsert(Path(filepath).name, state, Path(filepath).stat())
+            if mtime_before is not None and mtime_before == self._stored_mtime():
+                self._mark_fresh()
+            self._conn.commit()
+    
+    def remove(self, filename: str, mtime_before: Optional[int] = None):
+        with self._lock:
+            self._conn.execute("DELETE FROM slots WHERE filename = ?", (filename,))
+            if mtime_before is not None and mtime_before == self._stored_mtime():
+                self._mark_fresh()
+            self._conn.commit()
+    
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        self.refresh()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM slots ORDER BY last_save_time DESC, filename LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+    
+    def latest(self) -> Optional[Dict]:
+        slots = self.page(limit=1)
+        return slots[0] if slots else None
+    
+    def count(self) -> int:
+        self.refresh()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM slots").fetchone()[0]
+
+
+_manifest_instance: Optional[SaveManifest] = None
+
+
+def get_save_manifest() -> SaveManifest:
+    global _manifest_instance
+    if _manifest_instance is None:
+        _manifest_instance = SaveManifest()
+    return _manifest_instance
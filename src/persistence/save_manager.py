@@ -1,92 +1,112 @@
 
-import json
+import asyncio
 import os
 from datetime import datetime
 from typing import Optional, List
 from pathlib import Path
 
-from src.game_state import GameState
-from src.config import SAVE_DIRECTORY
+from src.game_state import GameState, create_initial_state
+from src.config import SAVE_DIRECTORY, SAVE_FORMAT
+from src.persistence.codecs import get_codec, decode_state, save_extensions
+from src.persistence.manifest import get_save_manifest
 
 
-def save_game(state: GameState, filename: Optional[str] = None) -> str:
+def _strip_extension(filename: str) -> str:
+    for extension in save_extensions():
+        if filename.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+
+def resolve_save_path(filename: str) -> Path:
+    if filename.endswith(save_extensions()):
+        return SAVE_DIRECTORY / filename
+    
+    for extension in save_extensions():
+        filepath = SAVE_DIRECTORY / (filename + extension)
+        if filepath.exists():
+            return filepath
+    return SAVE_DIRECTORY / (filename + ".json")
+
+
+def read_save_file(filepath: Path) -> dict:
+    with open(filepath, "rb") as f:
+        return decode_state(f.read())
+
+
+def save_game(state: GameState, filename: Optional[str] = None, save_format: Optional[str] = None) -> str:
     SAVE_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    codec = get_codec(save_format or SAVE_FORMAT)
+    manifest = get_save_manifest()
+    manifest.refresh()
+    mtime_before = manifest.directory_mtime()
     
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"save_{state['player_name']}_{timestamp}"
     
-    if not filename.endswith(".json"):
-        filename += ".json"
-    
-    filepath = SAVE_DIRECTORY / filename
+    filepath = SAVE_DIRECTORY / (_strip_extension(filename) + codec.extension)
     
     state_copy = dict(state)
     state_copy["last_save_time"] = datetime.now().isoformat()
     
-    with open(filepath, "w") as f:
-        json.dump(state_copy, f, indent=2)
+    temp_path = filepath.with_name(filepath.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(codec.encode(state_copy))
+    os.replace(temp_path, filepath)
+    manifest.record(filepath, state_copy, mtime_before)
     
     print(f"Game saved to: {filepath}")
     return str(filepath)
 
 
 def load_game(filename: str) -> GameState:
-    if not filename.endswith(".json"):
-        filename += ".json"
-    
-    filepath = SAVE_DIRECTORY / filename
+    filepath = resolve_save_path(filename)
     
     if not filepath.exists():
         raise FileNotFoundError(f"Save file not found: {filepath}")
     
-    with open(filepath, "r") as f:
-        state = json.load(f)
+    state = read_save_file(filepath)
     
     print(f"Game loaded from: {filepath}")
-    return GameState(**state)
+    return GameState(**{**create_initial_state(state.get("player_name", "Adventurer")), **state})
+
 
+async def asave_game(state: GameState, filename: Optional[str] = None, save_format: Optional[str] = None) -> str:
+    return await asyncio.to_thread(save_game, dict(state), filename, save_format)
 
-def list_save_files() -> List[dict]:
+
+async def aload_game(filename: str) -> GameState:
+    return await asyncio.to_thread(load_game, filename)
+
+
+def list_save_files(offset: int = 0, limit: Optional[int] = None) -> List[dict]:
     if not SAVE_DIRECTORY.exists():
         return []
-    
-    saves = []
-    for filepath in SAVE_DIRECTORY.glob("*.json"):
-        try:
-            with open(filepath, "r") as f:
-                data = json.load(f)
-                saves.append({
-                    "filename": filepath.name,
-                    "player_name": data.get("player_name", "Unknown"),
-                    "last_save_time": data.get("last_save_time", "Unknown"),
-                    "location": data.get("current_location", "Unknown"),
-                    "level": data.get("level", 1)
-                })
-        except Exception as e:
-            print(f"Error reading save file {filepath}: {e}")
-    
-    saves.sort(key=lambda x: x["last_save_time"], reverse=True)
-    
-    return saves
+    return get_save_manifest().page(offset, limit)
+
+
+def count_save_files() -> int:
+    if not SAVE_DIRECTORY.exists():
+        return 0
+    return get_save_manifest().count()
 
 
 def get_last_save() -> Optional[str]:
-    saves = list_save_files()
-    if saves:
-        return saves[0]["filename"]
-    return None
+    save = get_save_manifest().latest() if SAVE_DIRECTORY.exists() else None
+    return save["filename"] if save else None
 
 
 def delete_save(filename: str) -> bool:
-    if not filename.endswith(".json"):
-        filename += ".json"
-    
-    filepath = SAVE_DIRECTORY / filename
+    filepath = resolve_save_path(filename)
     
     try:
         if filepath.exists():
+            manifest = get_save_manifest()
+            manifest.refresh()
+            mtime_before = manifest.directory_mtime()
             filepath.unlink()
+            manifest.remove(filepath.name, mtime_before)
             print(f"Deleted save file: {filepath}")
             return True
         else:
@@ -1,3 +1,6 @@
+from src.rag.context_packer import pack_context
+
+
 
 STORY_GENERATOR_PROMPT = """You are the narrator for a medieval fantasy RPG game.
 
@@ -54,6 +57,7 @@ NPC_BASE_PROMPT = """You are {npc_name}, a character in a medieval fantasy world
 - Current location: {current_location}
 - Player just said/did: {player_action}
 - Conversation history: {conversation_history}
+- Relevant lore: {lore_context}
 
 **Instructions:**
 1. Respond in character, staying true to your personality
@@ -126,29 +130,40 @@ Analyze the action and determine what state changes should occur:
 Return a structured analysis of what should change and why.
 """
 
+RELATIONSHIP_LEVELS = {
+    (-100, -50): "Hostile - they dislike you",
+    (-49, -10): "Unfriendly - they're wary of you",
+    (-9, 10): "Neutral - they don't know you well",
+    (11, 50): "Friendly - they like you",
+    (51, 100): "Allied - they trust you deeply"
+}
+
+
+def get_relationship_level(relationship: int) -> str:
+    for (min_val, max_val), description in RELATIONSHIP_LEVELS.items():
+        if min_val <= relationship <= max_val:
+            return description
+    return "Neutral"
+
+
+def get_relationship_band(relationship: int) -> str:
+    return get_relationship_level(relationship).split(" - ")[0].lower()
+
+
 def format_npc_prompt(npc_data: dict, player_name: str, current_location: str, 
                       player_action: str, conversation_history: list, 
-                      relationship: int) -> str:
+                      relationship: int, lore_context: list = None) -> str:
     
-    relationship_levels = {
-        (-100, -50): "Hostile - they dislike you",
-        (-49, -10): "Unfriendly - they're wary of you",
-        (-9, 10): "Neutral - they don't know you well",
-        (11, 50): "Friendly - they like you",
-        (51, 100): "Allied - they trust you deeply"
-    }
-    
-    rel_level = "Neutral"
-    for (min_val, max_val), description in relationship_levels.items():
-        if min_val <= relationship <= max_val:
-            rel_level = description
-            break
+    rel_level = get_relationship_level(relationship)
     
     history_text = "\n".join([
         f"  - {msg.get('speaker', 'Unknown')}: {msg.get('message', '')}"
         for msg in conversation_history[-3:]
     ]) if conversation_history else "No previous conversation"
     
+    lore_context = pack_context(lore_context, node="npc_interaction") if lore_context else []
+    lore_text = "\n".join([f"  - {item}" for item in lore_context]) if lore_context else "Nothing specific"
+    
     return NPC_BASE_PROMPT.format(
         npc_name=npc_data["name"],
         personality=npc_data["personality"],
@@ -157,11 +172,13 @@ def format_npc_prompt(npc_data: dict, player_name: str, current_location: str,
         player_name=player_name,
         current_location=current_location,
         player_action=player_action,
-        conversation_history=history_text
+        conversation_history=history_text,
+        lore_context=lore_text
     )
 
 
 def format_story_prompt(location: str, action: str, lore_context: list) -> str:
+    lore_context = pack_context(lore_context, node="story_generator") if lore_context else []
     lore_text = "\n".join([f"- {item}" for item in lore_context]) if lore_context else "No specific lore retrieved"
     
     return STORY_GENERATOR_PROMPT.format(
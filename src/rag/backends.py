@@ -0,0 +1,644 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+QUANTIZATION_MODES = ("none", "float16", "int8")
+SCORE_BLOCK_ROWS = 8192
+
+COLLECTION_NAME = "game_lore"
+COLLECTION_METADATA = {"description": "Medieval fantasy RPG world lore", "hnsw:space": "cosine"}
+
+STORE_FILES = {
+    "matrix": "embeddings.f32",
+    "documents": "documents.jsonl",
+    "records": "records.jsonl",
+    "index": "index.json"
+}
+LEGACY_FILES = ("embeddings.npy", "records.json")
+
+
+class VectorBackend:
+    name = "base"
+    
+    def count(self) -> int:
+        raise NotImplementedError
+    
+    def get_hashes(self, ids: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        raise NotImplementedError
+    
+    def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        raise NotImplementedError
+    
+    def delete(self, ids: List[str]):
+        raise NotImplementedError
+    
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int,
+        filter_tags: Optional[List[str]] = None
+    ) -> List[List[Dict]]:
+        raise NotImplementedError
+    
+    def query_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: List[int],
+        filter_tags: List[Optional[List[str]]]
+    ) -> List[List[Dict]]:
+        groups: Dict[tuple, List[int]] = {}
+        for i, tags in enumerate(filter_tags):
+            groups.setdefault(tuple(tags or ()), []).append(i)
+        
+        formatted: List[List[Dict]] = [[] for _ in query_embeddings]
+        for tags, indices in groups.items():
+            results = self.query(
+                [query_embeddings[i] for i in indices],
+                max(n_results[i] for i in indices),
+                list(tags) or None
+            )
+            for i, result in zip(indices, results):
+                formatted[i] = result[:n_results[i]]
+        
+        return formatted
+    
+    def get_by_category(self, category: str, limit: int) -> List[Dict]:
+        raise NotImplementedError
+    
+    def reset(self):
+        raise NotImplementedError
+    
+    def persist(self):
+        pass
+
+
+class ChromaBackend(VectorBackend):
+    name = "chroma"
+    
+    def __init__(self, persist_directory: str):
+        import chromadb
+        from chromadb.config import Settings
+        
+        self.client = chromadb.PersistentClient(
+            path=persist_directory,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        self.collection = self.client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata=COLLECTION_METADATA
+        )
+    
+    @property
+    def space(self) -> str:
+        return (self.collection.metadata or {}).get("hnsw:space", "l2")
+    
+    def _distance(self, value: Optional[float]) -> Optional[float]:
+        if value is None or self.space == "cosine":
+            return value
+        return value / 2.0
+    
+    def count(self) -> int:
+        return self.collection.count()
+    
+    def get_hashes(self, ids: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        if ids is not None and not ids:
+            return {}
+        
+        existing = self.collection.get(ids=ids, include=["metadatas"])
+        return {
+            doc_id: (metadata or {}).get("content_hash")
+            for doc_id, metadata in zip(existing["ids"], existing["metadatas"])
+        }
+    
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+    
+    def delete(self, ids):
+        self.collection.delete(ids=ids)
+    
+    def query(self, query_embeddings, n_results, filter_tags=None):
+        where_filter = None
+        if filter_tags:
+            where_filter = {"tags": {"$in": filter_tags}}
+        
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where_filter if where_filter else None
+        )
+        
+        formatted = []
+        for q in range(len(query_embeddings)):
+            formatted_results = []
+            if results['documents'] and len(results['documents']) > q:
+                for i in range(len(results['documents'][q])):
+                    formatted_results.append({
+                        "id": results['ids'][q][i],
+                        "content": results['documents'][q][i],
+                        "metadata": results['metadatas'][q][i],
+                        "distance": self._distance(results['distances'][q][i]) if results.get('distances') else None
+                    })
+            formatted.append(formatted_results)
+        
+        return formatted
+    
+    def get_by_category(self, category, limit):
+        results = self.collection.get(
+            where={"category": category},
+            limit=limit
+        )
+        
+        formatted_results = []
+        if results['documents']:
+            for i in range(len(results['documents'])):
+                formatted_results.append({
+                    "id": results['ids'][i],
+                    "content": results['documents'][i],
+                    "metadata": results['metadatas'][i]
+                })
+        
+        return formatted_results
+    
+    def reset(self):
+        self.client.delete_collection(COLLECTION_NAME)
+        self.collection = self.client.create_collection(
+            name=COLLECTION_NAME,
+            metadata=COLLECTION_METADATA
+        )
+
+
+def tags_of(metadata: Dict) -> List[str]:
+    tags = metadata.get("tags", [])
+    if isinstance(tags, str):
+        return [tag.strip() for tag in tags.split(",") if tag.strip()]
+    return list(tags)
+
+
+class NumpyBackend(VectorBackend):
+    name = "numpy"
+    
+    def __init__(self, persist_directory: Optional[str] = None, quantization: str = "none", rescore_factor: int = 4):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization}")
+        
+        self.persist_directory = Path(persist_directory) if persist_directory else None
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor)
+        self.keeps_full_precision = self.persist_directory is not None or quantization == "none"
+        
+        self.ids: List[str] = []
+        self.metadatas: List[Dict] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self._offsets: List[int] = []
+        self._documents: Dict[int, str] = {}
+        self._pending_rows: List[np.ndarray] = []
+        self._pending_updates: Dict[int, np.ndarray] = {}
+        self._pending_records: Dict[int, bool] = {}
+        self._saved = {"rows": 0, "dim": 0, "documents": 0, "records": 0}
+        self._fresh = False
+        self._quantized: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._index: Dict[str, int] = {}
+        self._tag_masks: Dict[str, np.ndarray] = {}
+        self._category_masks: Dict[str, np.ndarray] = {}
+        
+        if self.persist_directory is not None:
+            self._load()
+    
+    def _paths(self) -> Dict[str, Path]:
+        return {name: self.persist_directory / filename for name, filename in STORE_FILES.items()}
+    
+    def _saved_size(self, name: str) -> int:
+        if name == "matrix":
+            return self._saved["rows"] * self._saved["dim"] * 4
+        return self._saved[name]
+    
+    def _load(self):
+        paths = self._paths()
+        if not paths["index"].exists():
+            for name in ("matrix", "documents", "records"):
+                paths[name].unlink(missing_ok=True)
+            self._load_legacy()
+            return
+        
+        with open(paths["index"], "r") as f:
+            self._saved = json.load(f)
+        
+        for name in ("matrix", "documents", "records"):
+            if paths[name].exists() and paths[name].stat().st_size > self._saved_size(name):
+                with open(paths[name], "r+b") as f:
+                    f.truncate(self._saved_size(name))
+        
+        if paths["records"].exists():
+            with open(paths["records"], "rb") as f:
+                for line in f:
+                    record = json.loads(line)
+                    row = record.get("row")
+                    if row is None:
+                        self.ids.append(record["id"])
+                        self.metadatas.append(record["metadata"])
+                        self._offsets.append(record["offset"])
+                    else:
+                        self.metadatas[row] = record["metadata"]
+                        self._offsets[row] = record["offset"]
+        
+        self._index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._open_matrix()
+    
+    def _load_legacy(self):
+        matrix_path, records_path = (self.persist_directory / filename for filename in LEGACY_FILES)
+        if not matrix_path.exists() or not records_path.exists():
+            return
+        
+        with open(records_path, "r") as f:
+            records = json.load(f)
+        
+        self.ids = records["ids"]
+        self.metadatas = records["metadatas"]
+        self._documents = dict(enumerate(records["documents"]))
+        self._offsets = [-1] * len(self.ids)
+        self.matrix = np.load(matrix_path, mmap_mode="r")
+        self._rewrite(range(len(self.ids)))
+        
+        matrix_path.unlink()
+        records_path.unlink()
+    
+    def _open_matrix(self):
+        rows, dim = self._saved["rows"], self._saved["dim"]
+        if rows:
+            self.matrix = np.memmap(self._paths()["matrix"], dtype=np.float32, mode="r+", shape=(rows, dim))
+        else:
+            self.matrix = np.zeros((0, dim), dtype=np.float32)
+        self._fresh = False
+    
+    def _write_index(self):
+        index_path = self._paths()["index"]
+        tmp_index = index_path.with_suffix(".json.tmp")
+        with open(tmp_index, "w") as f:
+            json.dump(self._saved, f)
+        os.replace(tmp_index, index_path)
+    
+    def _flush(self):
+        if not self._pending_rows and not self._pending_updates and not self._pending_records:
+            return
+        
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        paths = self._paths()
+        
+        if self._pending_updates:
+            for row, vector in self._pending_updates.items():
+                self.matrix[row] = vector
+            self.matrix.flush()
+        
+        if self._pending_rows:
+            rows = np.stack(self._pending_rows)
+            with open(paths["matrix"], "ab") as f:
+                f.write(np.ascontiguousarray(rows, dtype=np.float32).tobytes())
+            self._saved["rows"] += len(rows)
+            self._saved["dim"] = int(rows.shape[1])
+        
+        with open(paths["documents"], "ab") as documents, open(paths["records"], "ab") as records:
+            for row, is_update in self._pending_records.items():
+                record = {"id": self.ids[row], "metadata": self.metadatas[row], "offset": documents.tell()}
+                if is_update:
+                    record["row"] = row
+                documents.write(json.dumps(self._documents.pop(row)).encode("utf-8") + b"\n")
+                records.write(json.dumps(record).encode("utf-8") + b"\n")
+                self._offsets[row] = record["offset"]
+            self._saved["documents"] = documents.tell()
+            self._saved["records"] = records.tell()
+        
+        self._write_index()
+        self._pending_rows, self._pending_updates, self._pending_records = [], {}, {}
+        self._open_matrix()
+    
+    def _rewrite(self, keep):
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        paths = self._paths()
+        tmp_paths = {name: path.with_name(path.name + ".tmp") for name, path in paths.items() if name != "index"}
+        
+        keep = list(keep)
+        dim = int(self.matrix.shape[1])
+        ids, metadatas, offsets = [], [], []
+        
+        with open(tmp_paths["matrix"], "wb") as matrix, open(tmp_paths["documents"], "wb") as documents, \
+                open(tmp_paths["records"], "wb") as records:
+            for start in range(0, len(keep), SCORE_BLOCK_ROWS):
+                block = keep[start:start + SCORE_BLOCK_ROWS]
+                matrix.write(np.ascontiguousarray(self.matrix[block], dtype=np.float32).tobytes())
+                for row, document in zip(block, self._read_documents(block)):
+                    offsets.append(documents.tell())
+                    ids.append(self.ids[row])
+                    metadatas.append(self.metadatas[row])
+                    documents.write(json.dumps(document).encode("utf-8") + b"\n")
+                    records.write(json.dumps({"id": ids[-1], "metadata": metadatas[-1], "offset": offsets[-1]}).encode("utf-8") + b"\n")
+            self._saved = {"rows": len(keep), "dim": dim, "documents": documents.tell(), "records": records.tell()}
+        
+        self.matrix = np.zeros((0, dim), dtype=np.float32)
+        paths["index"].unlink(missing_ok=True)
+        for name, tmp_path in tmp_paths.items():
+            os.replace(tmp_path, paths[name])
+        self._write_index()
+        
+        self.ids, self.metadatas, self._offsets = ids, metadatas, offsets
+        self._documents = {}
+        self._index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._open_matrix()
+    
+    def _read_documents(self, rows) -> List[str]:
+        documents = []
+        handle = None
+        try:
+            for row in rows:
+                row = int(row)
+                if row in self._documents:
+                    documents.append(self._documents[row])
+                    continue
+                if handle is None:
+                    handle = open(self._paths()["documents"], "rb")
+                handle.seek(self._offsets[row])
+                documents.append(json.loads(handle.readline()))
+        finally:
+            if handle is not None:
+                handle.close()
+        return documents
+    
+    def _materialize(self):
+        if self.persist_directory is not None:
+            self._flush()
+            return
+        
+        if self._pending_rows:
+            rows = np.stack(self._pending_rows)
+            if self.keeps_full_precision:
+                matrix = self.matrix if self.matrix.size else np.zeros((0, rows.shape[1]), dtype=np.float32)
+                self.matrix = np.ascontiguousarray(np.vstack([matrix, rows]))
+            else:
+                self._append_quantized(rows)
+            self._pending_rows = []
+            self._fresh = False
+        
+        if self._pending_updates:
+            for row, vector in self._pending_updates.items():
+                if self.keeps_full_precision:
+                    self.matrix[row] = vector
+                else:
+                    quantized, scales = self._quantize_block(vector[None, :])
+                    self._quantized[row] = quantized[0]
+                    if scales is not None:
+                        self._scales[row] = scales[0]
+            self._pending_updates = {}
+            self._fresh = False
+    
+    def persist(self):
+        self._materialize()
+    
+    def _prepare(self):
+        self._materialize()
+        if not self._fresh:
+            self._reindex()
+            if self.keeps_full_precision:
+                self._quantize()
+            self._fresh = True
+    
+    def _quantize(self):
+        if self.quantization == "none" or not self.matrix.size:
+            self._quantized, self._scales = None, None
+            return
+        
+        quantized, scales = [], []
+        for start in range(0, self.matrix.shape[0], SCORE_BLOCK_ROWS):
+            block_quantized, block_scales = self._quantize_block(
+                np.asarray(self.matrix[start:start + SCORE_BLOCK_ROWS], dtype=np.float32)
+            )
+            quantized.append(block_quantized)
+            if block_scales is not None:
+                scales.append(block_scales)
+        
+        self._quantized = np.concatenate(quantized)
+        self._scales = np.concatenate(scales) if scales else None
+    
+    def _quantize_block(self, block: np.ndarray):
+        if self.quantization == "float16":
+            return block.astype(np.float16), None
+        
+        scales = np.abs(block).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(block / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    
+    def _append_quantized(self, rows: np.ndarray):
+        quantized, scales = self._quantize_block(rows)
+        if self._quantized is not None:
+            quantized = np.concatenate([self._quantized, quantized])
+            if scales is not None:
+                scales = np.concatenate([self._scales, scales])
+        self._quantized, self._scales = quantized, scales
+    
+    def _row_count(self) -> int:
+        if self.keeps_full_precision or self._quantized is None:
+            return self.matrix.shape[0]
+        return self._quantized.shape[0]
+    
+    def memory_usage(self) -> Dict[str, int]:
+        self._prepare()
+        in_memory = not isinstance(self.matrix, np.memmap)
+        quantized = 0
+        if self._quantized is not None:
+            quantized = self._quantized.nbytes + (self._scales.nbytes if self._scales is not None else 0)
+        return {
+            "full_precision_resident": int(self.matrix.nbytes) if in_memory else 0,
+            "full_precision_mapped": 0 if in_memory else int(self.matrix.nbytes),
+            "quantized": int(quantized),
+            "search_matrix": int(quantized) if self._quantized is not None else int(self.matrix.nbytes),
+            "documents_resident": sum(len(document) for document in self._documents.values())
+        }
+    
+    def _reindex(self):
+        self._index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        
+        tag_masks: Dict[str, np.ndarray] = {}
+        category_masks: Dict[str, np.ndarray] = {}
+        for i, metadata in enumerate(self.metadatas):
+            for tag in tags_of(metadata):
+                tag_masks.setdefault(tag, np.zeros(len(self.ids), dtype=bool))[i] = True
+            category = metadata.get("category")
+            if category is not None:
+                category_masks.setdefault(category, np.zeros(len(self.ids), dtype=bool))[i] = True
+        
+        self._tag_masks = tag_masks
+        self._category_masks = category_masks
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+    
+    def count(self) -> int:
+        return len(self.ids)
+    
+    def get_hashes(self, ids: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        if ids is None:
+            return {doc_id: metadata.get("content_hash") for doc_id, metadata in zip(self.ids, self.metadatas)}
+        return {
+            doc_id: self.metadatas[self._index[doc_id]].get("content_hash")
+            for doc_id in ids if doc_id in self._index
+        }
+    
+    def upsert(self, ids, embeddings, documents, metadatas):
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        materialized = self._row_count()
+        
+        for doc_id, vector, document, metadata in zip(ids, vectors, documents, metadatas):
+            index = self._index.get(doc_id)
+            if index is None:
+                index = self._index[doc_id] = len(self.ids)
+                self.ids.append(doc_id)
+                self.metadatas.append(metadata)
+                self._offsets.append(-1)
+                self._pending_rows.append(vector)
+            else:
+                self.metadatas[index] = metadata
+                if index >= materialized:
+                    self._pending_rows[index - materialized] = vector
+                else:
+                    self._pending_updates[index] = vector
+            
+            self._documents[index] = document
+            if self.persist_directory is not None:
+                self._pending_records.setdefault(index, index < materialized)
+        
+        self._fresh = False
+    
+    def delete(self, ids):
+        remove = {self._index[doc_id] for doc_id in ids if doc_id in self._index}
+        if not remove:
+            return
+        
+        self._materialize()
+        keep = [i for i in range(len(self.ids)) if i not in remove]
+        
+        if self.persist_directory is not None:
+            self._rewrite(keep)
+            return
+        
+        self.ids = [self.ids[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+        self._documents = {new: self._documents[old] for new, old in enumerate(keep)}
+        self._offsets = [-1] * len(keep)
+        if self.keeps_full_precision:
+            self.matrix = np.ascontiguousarray(self.matrix[keep])
+        else:
+            self._quantized = self._quantized[keep]
+            self._scales = self._scales[keep] if self._scales is not None else None
+        self._index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._fresh = False
+    
+    def filter_mask(self, filter_tags: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        self._prepare()
+        if not filter_tags:
+            return None
+        
+        mask = np.zeros(len(self.ids), dtype=bool)
+        for tag in filter_tags:
+            tag_mask = self._tag_masks.get(tag)
+            if tag_mask is not None:
+                mask |= tag_mask
+        return mask
+    
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        self._prepare()
+        if self._quantized is None:
+            return queries @ np.asarray(self.matrix).T
+        
+        scores = np.empty((len(queries), len(self.ids)), dtype=np.float32)
+        for start in range(0, len(self.ids), SCORE_BLOCK_ROWS):
+            block = self._quantized[start:start + SCORE_BLOCK_ROWS].astype(np.float32)
+            if self._scales is not None:
+                block *= self._scales[start:start + SCORE_BLOCK_ROWS, None]
+            scores[:, start:start + SCORE_BLOCK_ROWS] = queries @ block.T
+        return scores
+    
+    def query(self, query_embeddings, n_results, filter_tags=None):
+        return self.query_batch(
+            query_embeddings,
+            [n_results] * len(query_embeddings),
+            [filter_tags] * len(query_embeddings)
+        )
+    
+    def query_batch(self, query_embeddings, n_results, filter_tags):
+        if not self.ids or max(n_results, default=0) <= 0:
+            return [[] for _ in query_embeddings]
+        
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        scores = self.scores(queries)
+        
+        for q, tags in enumerate(filter_tags):
+            mask = self.filter_mask(tags)
+            if mask is not None:
+                scores[q, ~mask] = -np.inf
+        
+        rescore = self._quantized is not None and self.keeps_full_precision
+        k = min(max(n_results), len(self.ids))
+        if rescore:
+            k = min(len(self.ids), k * self.rescore_factor)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        
+        formatted = []
+        for q in range(len(queries)):
+            candidates = top[q][np.isfinite(scores[q, top[q]])]
+            if rescore:
+                candidate_scores = np.asarray(self.matrix[candidates], dtype=np.float32) @ queries[q]
+            else:
+                candidate_scores = scores[q, candidates]
+            
+            order = np.argsort(-candidate_scores)[:n_results[q]]
+            rows = candidates[order]
+            formatted.append([
+                {
+                    "id": self.ids[row],
+                    "content": document,
+                    "metadata": self.metadatas[row],
+                    "distance": float(1.0 - score)
+                }
+                for row, document, score in zip(rows, self._read_documents(rows), candidate_scores[order])
+            ])
+        
+        return formatted
+    
+    def get_by_category(self, category, limit):
+        self._prepare()
+        mask = self._category_masks.get(category)
+        if mask is None:
+            return []
+        
+        rows = np.flatnonzero(mask)[:limit]
+        return [
+            {"id": self.ids[row], "content": document, "metadata": self.metadatas[row]}
+            for row, document in zip(rows, self._read_documents(rows))
+        ]
+    
+    def reset(self):
+        self.ids, self.metadatas, self._offsets = [], [], []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self._quantized, self._scales = None, None
+        self._documents = {}
+        self._pending_rows, self._pending_updates, self._pending_records = [], {}, {}
+        self._index = {}
+        self._fresh = False
+        
+        if self.persist_directory is not None:
+            self._rewrite([])
+
+
+def create_backend(name: str, persist_directory: str, quantization: str = "none", rescore_factor: int = 4) -> VectorBackend:
+    if name == "chroma":
+        return ChromaBackend(persist_directory)
+    elif name == "numpy":
+        return NumpyBackend(persist_directory, quantization=quantization, rescore_factor=rescore_factor)
+    else:
+        raise ValueError(f"Unknown vector backend: {name}")
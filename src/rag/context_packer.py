@@ -0,0 +1,150 @@
+import math
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Union
+
+from src.config import (
+    LLM_PROVIDER,
+    CONTEXT_TOKEN_BUDGETS,
+    CONTEXT_MAX_DISTANCE,
+    CONTEXT_MMR_LAMBDA,
+    CONTEXT_DUPLICATE_THRESHOLD,
+    get_model_name
+)
+from src.utils.metrics import get_metrics
+
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+def approximate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(model: Optional[str] = None) -> Callable[[str], int]:
+    if model is None:
+        model = get_model_name(LLM_PROVIDER)
+    
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            if LLM_PROVIDER != "openai":
+                return approximate_tokens
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+    except ImportError:
+        return approximate_tokens
+
+
+def word_set(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _relevance(pieces: List[Dict]) -> List[float]:
+    max_scores = {}
+    for piece in pieces:
+        for key in ("rrf_score", "score"):
+            if piece.get(key) is not None:
+                max_scores[key] = max(max_scores.get(key, 0.0), piece[key])
+    
+    relevance = []
+    for rank, piece in enumerate(pieces):
+        if piece.get("distance") is not None:
+            relevance.append(max(0.0, 1.0 - piece["distance"] / 2.0))
+        elif piece.get("rrf_score") is not None and max_scores["rrf_score"] > 0:
+            relevance.append(piece["rrf_score"] / max_scores["rrf_score"])
+        elif piece.get("score") is not None and max_scores["score"] > 0:
+            relevance.append(piece["score"] / max_scores["score"])
+        else:
+            relevance.append(1.0 / (1.0 + 0.1 * rank))
+    return relevance
+
+
+class ContextPacker:
+    
+    def __init__(
+        self,
+        token_budget: int,
+        max_distance: float = CONTEXT_MAX_DISTANCE,
+        mmr_lambda: float = CONTEXT_MMR_LAMBDA,
+        duplicate_threshold: float = CONTEXT_DUPLICATE_THRESHOLD,
+        count_tokens: Optional[Callable[[str], int]] = None
+    ):
+        self.token_budget = token_budget
+        self.max_distance = max_distance
+        self.mmr_lambda = mmr_lambda
+        self.duplicate_threshold = duplicate_threshold
+        self.count_tokens = count_tokens or get_token_counter()
+    
+    def _candidates(self, results: List[Union[str, Dict]]) -> List[Dict]:
+        pieces = [{"content": result} if isinstance(result, str) else result for result in results]
+        pieces = [
+            piece for piece in pieces
+            if piece.get("content") and (piece.get("distance") is None or piece["distance"] <= self.max_distance)
+        ]
+        
+        candidates = []
+        for piece, relevance in zip(pieces, _relevance(pieces)):
+            words = word_set(piece["content"])
+            if any(jaccard(words, other["words"]) >= self.duplicate_threshold for other in candidates):
+                continue
+            candidates.append({"content": piece["content"], "words": words, "relevance": relevance})
+        return candidates
+    
+    def order(self, results: List[Union[str, Dict]]) -> List[str]:
+        candidates = self._candidates(results)
+        ordered = []
+        
+        while candidates:
+            best = max(
+                candidates,
+                key=lambda c: self.mmr_lambda * c["relevance"] - (1 - self.mmr_lambda) * max(
+                    (jaccard(c["words"], chosen["words"]) for chosen in ordered), default=0.0
+                )
+            )
+            candidates.remove(best)
+            ordered.append(best)
+        
+        return [candidate["content"] for candidate in ordered]
+    
+    def pack(self, results: List[Union[str, Dict]]) -> List[str]:
+        packed = []
+        remaining = self.token_budget
+        
+        for content in self.order(results):
+            tokens = self.count_tokens(content)
+            if tokens <= remaining:
+                packed.append(content)
+                remaining -= tokens
+                continue
+            
+            sentences = []
+            for sentence in SENTENCE_BOUNDARY.split(content):
+                tokens = self.count_tokens(sentence)
+                if tokens > remaining:
+                    break
+                sentences.append(sentence)
+                remaining -= tokens
+            if sentences:
+                packed.append(" ".join(sentences))
+            break
+        
+        return packed
+
+
+def pack_context(results: List[Union[str, Dict]], node: str = "default", token_budget: Optional[int] = None) -> List[str]:
+    if token_budget is None:
+        token_budget = CONTEXT_TOKEN_BUDGETS.get(node, CONTEXT_TOKEN_BUDGETS["default"])
+    packer = ContextPacker(token_budget)
+    packed = packer.pack(results)
+    get_metrics().observe(f"context.{node}.tokens", sum(packer.count_tokens(piece) for piece in packed))
+    return packed
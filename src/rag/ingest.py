@@ -0,0 +1,348 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.config import (
+    EMBEDDING_MODEL,
+    INGEST_BATCH_SIZE,
+    INGEST_CHUNK_CHARS,
+    INGEST_CHUNK_OVERLAP,
+    INGEST_WORKERS,
+    INGEST_CHECKPOINT_EVERY,
+    INGEST_CHECKPOINT_PATH,
+    get_embeddings
+)
+from src.rag.lore_build import hash_document, write_artifact
+
+
+INGEST_ID_PREFIX = "ingest:"
+SOURCE_SUFFIXES = (".md", ".markdown", ".jsonl")
+SEEN_FLUSH_EVERY = 1024
+
+
+def iter_source_files(root: Path) -> Iterator[Path]:
+    if root.is_file():
+        yield root
+        return
+    
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(SOURCE_SUFFIXES):
+                yield Path(dirpath) / filename
+
+
+def chunk_text(segments: Iterable[str], chunk_size: int, overlap: int) -> Iterator[str]:
+    buffer = ""
+    carried = 0
+    
+    for segment in segments:
+        buffer += segment
+        while len(buffer) >= chunk_size:
+            cut = buffer.rfind(" ", overlap + 1, chunk_size)
+            if cut <= overlap:
+                cut = chunk_size
+            
+            chunk = buffer[:cut].strip()
+            if chunk:
+                yield chunk
+            
+            start = buffer.find(" ", cut - overlap, cut)
+            start = start if start != -1 else cut - overlap
+            carried = len(buffer[start:cut].lstrip())
+            buffer = buffer[start:].lstrip()
+    
+    if buffer.strip() and len(buffer) > carried:
+        yield buffer.strip()
+
+
+def _read_lines(path: Path) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line
+
+
+def _markdown_title(path: Path) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                return line.strip().lstrip("#").strip() if line.startswith("#") else path.stem
+    return path.stem
+
+
+def iter_documents(root: Path, namespace: str) -> Iterator[Dict]:
+    for path in iter_source_files(root):
+        relative = path.relative_to(root).as_posix() if root.is_dir() else path.name
+        tags = [part for part in Path(relative).parent.parts] or ["ingested"]
+        
+        if path.suffix == ".jsonl":
+            with open(path, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        print(f"Skipping {relative}:{line_no}: {e}")
+                        continue
+                    
+                    content = record.get("content") or record.get("text")
+                    if not content:
+                        continue
+                    
+                    yield {
+                        "id": f"{namespace}/{relative}:{record.get('id', line_no)}",
+                        "metadata": {
+                            "title": record.get("title", f"{path.stem} {line_no}"),
+                            "tags": record.get("tags", tags),
+                            "category": record.get("category", "ingested_lore")
+                        },
+                        "segments": [content]
+                    }
+        else:
+            yield {
+                "id": f"{namespace}/{relative}",
+                "metadata": {"title": _markdown_title(path), "tags": tags, "category": "ingested_lore"},
+                "segments": _read_lines(path)
+            }
+
+
+def iter_chunks(root: Path, namespace: str, chunk_size: int, overlap: int) -> Iterator[Dict]:
+    for doc in iter_documents(root, namespace):
+        for i, chunk in enumerate(chunk_text(doc["segments"], chunk_size, overlap)):
+            metadata = dict(doc["metadata"], source=doc["id"], chunk=i)
+            metadata["content_hash"] = hash_document({"content": chunk, "metadata": metadata})
+            yield {"id": f"{INGEST_ID_PREFIX}{doc['id']}#{i}", "content": chunk, "metadata": metadata}
+
+
+class SeenIds:
+    
+    def __init__(self):
+        self._conn = sqlite3.connect("")
+        self._conn.execute("CREATE TABLE seen (id TEXT PRIMARY KEY)")
+        self._buffer: List[tuple] = []
+    
+    def add(self, doc_id: str):
+        self._buffer.append((doc_id,))
+        if len(self._buffer) >= SEEN_FLUSH_EVERY:
+            self._flush()
+    
+    def _flush(self):
+        self._conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)", self._buffer)
+        self._buffer = []
+    
+    def __contains__(self, doc_id: str) -> bool:
+        self._flush()
+        return self._conn.execute("SELECT 1 FROM seen WHERE id = ?", (doc_id,)).fetchone() is not None
+    
+    def close(self):
+        self._conn.close()
+
+
+_worker_embeddings = None
+
+
+def _init_worker():
+    global _worker_embeddings
+    _worker_embeddings = get_embeddings()
+
+
+def _embed_in_worker(texts: List[str]) -> List[List[float]]:
+    return [list(vector) for vector in _worker_embeddings.embed_documents(texts)]
+
+
+class LoreIngestor:
+    
+    def __init__(
+        self,
+        vector_store,
+        batch_size: int = INGEST_BATCH_SIZE,
+        workers: int = INGEST_WORKERS,
+        chunk_size: int = INGEST_CHUNK_CHARS,
+        overlap: int = INGEST_CHUNK_OVERLAP,
+        checkpoint_path: Path = INGEST_CHECKPOINT_PATH,
+        checkpoint_every: int = INGEST_CHECKPOINT_EVERY,
+        verbose: bool = True
+    ):
+        if overlap >= chunk_size:
+            raise ValueError("Chunk overlap must be smaller than the chunk size")
+        
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.checkpoint_path = Path(checkpoint_path)
+        self.checkpoint_every = checkpoint_every
+        self.verbose = verbose
+    
+    def _checkpoint_key(self, root: Path, namespace: str) -> Dict:
+        return {
+            "root": str(root.resolve()),
+            "namespace": namespace,
+            "chunk_size": self.chunk_size,
+            "overlap": self.overlap,
+            "embedding_model": EMBEDDING_MODEL
+        }
+    
+    def load_checkpoint(self, root: Path, namespace: str) -> int:
+        if not self.checkpoint_path.exists():
+            return 0
+        
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            print(f"Error reading ingest checkpoint: {e}")
+            return 0
+        
+        if {key: checkpoint.get(key) for key in self._checkpoint_key(root, namespace)} != self._checkpoint_key(root, namespace):
+            return 0
+        return checkpoint.get("chunks_done", 0)
+    
+    def save_checkpoint(self, root: Path, namespace: str, chunks_done: int):
+        checkpoint = dict(self._checkpoint_key(root, namespace), chunks_done=chunks_done, updated_at=datetime.now().isoformat())
+        write_artifact(checkpoint, self.checkpoint_path)
+    
+    def _changed(self, candidates: List[Dict], stats: Dict) -> List[Dict]:
+        if not candidates:
+            return []
+        
+        stored = self.vector_store.backend.get_hashes([chunk["id"] for chunk in candidates])
+        changed = [chunk for chunk in candidates if stored.get(chunk["id"]) != chunk["metadata"]["content_hash"]]
+        stats["unchanged"] += len(candidates) - len(changed)
+        return changed
+    
+    def _batches(self, chunks: Iterator[Dict], skip: int, seen: SeenIds, stats: Dict):
+        batch = []
+        candidates = []
+        position = 0
+        
+        for position, chunk in enumerate(chunks, 1):
+            seen.add(chunk["id"])
+            stats["chunks"] += 1
+            
+            if position <= skip:
+                continue
+            
+            candidates.append(chunk)
+            if len(candidates) >= self.batch_size:
+                batch.extend(self._changed(candidates, stats))
+                candidates = []
+                if len(batch) >= self.batch_size:
+                    yield batch, position
+                    batch = []
+        
+        batch.extend(self._changed(candidates, stats))
+        if batch:
+            yield batch, position
+    
+    def _embedded(self, batches):
+        if self.workers <= 1:
+            embeddings = self.vector_store.embeddings
+            for batch, position in batches:
+                yield batch, position, embeddings.embed_documents([chunk["content"] for chunk in batch])
+            return
+        
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            in_flight = deque()
+            for batch, position in batches:
+                in_flight.append((batch, position, pool.submit(_embed_in_worker, [chunk["content"] for chunk in batch])))
+                if len(in_flight) >= self.workers * 2:
+                    batch, position, future = in_flight.popleft()
+                    yield batch, position, future.result()
+            
+            while in_flight:
+                batch, position, future = in_flight.popleft()
+                yield batch, position, future.result()
+    
+    def _report(self, stats: Dict, started: float, final: bool = False):
+        if not self.verbose:
+            return
+        rate = stats["embedded"] / max(time.perf_counter() - started, 1e-9)
+        print(
+            f"\r  {stats['chunks']} chunks scanned, {stats['embedded']} embedded, "
+            f"{stats['unchanged']} unchanged ({rate:.1f} chunks/s)",
+            end="\n" if final else "",
+            flush=True
+        )
+    
+    def run(self, root, namespace: Optional[str] = None, resume: bool = True) -> Dict:
+        root = Path(root)
+        namespace = namespace or root.stem
+        backend = self.vector_store.backend
+        
+        skip = self.load_checkpoint(root, namespace) if resume else 0
+        if skip and self.verbose:
+            print(f"Resuming ingestion of {root} after {skip} chunks.")
+        
+        stats = {"chunks": 0, "embedded": 0, "unchanged": 0, "skipped": skip, "removed": 0}
+        seen = SeenIds()
+        started = time.perf_counter()
+        
+        chunks = iter_chunks(root, namespace, self.chunk_size, self.overlap)
+        batches = self._batches(chunks, skip, seen, stats)
+        
+        for i, (batch, position, vectors) in enumerate(self._embedded(batches), 1):
+            backend.upsert(
+                ids=[chunk["id"] for chunk in batch],
+                embeddings=vectors,
+                documents=[chunk["content"] for chunk in batch],
+                metadatas=[chunk["metadata"] for chunk in batch]
+            )
+            stats["embedded"] += len(batch)
+            
+            if i % self.checkpoint_every == 0:
+                backend.persist()
+                self.save_checkpoint(root, namespace, position)
+            self._report(stats, started)
+        
+        prefix = f"{INGEST_ID_PREFIX}{namespace}/"
+        stale = [doc_id for doc_id in backend.get_hashes() if doc_id.startswith(prefix) and doc_id not in seen]
+        seen.close()
+        if stale:
+            backend.delete(stale)
+            stats["removed"] = len(stale)
+        
+        backend.persist()
+        if self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+        
+        self._report(stats, started, final=True)
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream Markdown/JSONL lore into the vector store")
+    parser.add_argument("path", help="Directory or file containing .md/.jsonl lore")
+    parser.add_argument("--namespace", help="ID namespace for this corpus (defaults to the directory name)")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_CHARS)
+    parser.add_argument("--overlap", type=int, default=INGEST_CHUNK_OVERLAP)
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint")
+    args = parser.parse_args()
+    
+    from src.rag.vector_store import get_vector_store
+    
+    ingestor = LoreIngestor(
+        get_vector_store(),
+        batch_size=args.batch_size,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap
+    )
+    stats = ingestor.run(args.path, namespace=args.namespace, resume=not args.restart)
+    print(f"Ingestion complete: {stats['embedded']} embedded, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from src.rag.backends import tags_of
+
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "for", "with", "by", "from",
+    "is", "are", "was", "were", "be", "it", "its", "this", "that", "i", "you", "me", "my",
+    "about", "into", "some", "please", "what", "who", "how"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = [token.split("'")[0] for token in re.findall(r"[a-z0-9]+(?:'[a-z]+)?", text.lower())]
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+class BM25Index:
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75, title_boost: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.title_boost = title_boost
+        
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        self._postings: Dict[str, List[tuple]] = {}
+        self._idf: Dict[str, float] = {}
+        self._lengths: List[int] = []
+        self._avg_length = 0.0
+        self._tags: List[set] = []
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def build(self, ids: List[str], documents: List[str], metadatas: List[Dict]):
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas)
+        self._tags = [set(tags_of(metadata)) for metadata in self.metadatas]
+        
+        postings: Dict[str, List[tuple]] = {}
+        lengths = []
+        for i, (document, metadata) in enumerate(zip(self.documents, self.metadatas)):
+            tokens = tokenize(document) + tokenize(metadata.get("title", "")) * self.title_boost
+            lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((i, tf))
+        
+        n_docs = len(self.ids)
+        self._postings = postings
+        self._lengths = lengths
+        self._avg_length = sum(lengths) / n_docs if n_docs else 0.0
+        self._idf = {
+            term: math.log((n_docs - len(docs) + 0.5) / (len(docs) + 0.5) + 1.0)
+            for term, docs in postings.items()
+        }
+    
+    @classmethod
+    def from_artifact(cls, artifact: Dict) -> "BM25Index":
+        index = cls()
+        documents = artifact.get("documents", {})
+        index.build(
+            ids=list(documents),
+            documents=[entry["content"] for entry in documents.values()],
+            metadatas=[entry["metadata"] for entry in documents.values()]
+        )
+        return index
+    
+    def scores(self, query: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / self._avg_length)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+    
+    def search(self, query: str, n_results: int = 3, filter_tags: Optional[List[str]] = None) -> List[Dict]:
+        scores = self.scores(query)
+        if filter_tags:
+            wanted = set(filter_tags)
+            scores = {i: score for i, score in scores.items() if self._tags[i] & wanted}
+        
+        ranked = sorted(scores.items(), key=lambda pair: (-pair[1], self.ids[pair[0]]))[:n_results]
+        return [
+            {
+                "id": self.ids[i],
+                "content": self.documents[i],
+                "metadata": self.metadatas[i],
+                "score": round(score, 4)
+            }
+            for i, score in ranked
+        ]
+
+
+def is_strong_hit(results: List[Dict], min_score: float, margin: float) -> bool:
+    if not results or results[0]["score"] < min_score:
+        return False
+    if len(results) == 1:
+        return True
+    return results[0]["score"] >= margin * results[1]["score"]
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Dict]], n_results: int, k: int = 60) -> List[Dict]:
+    fused: Dict[str, Dict] = {}
+    scores: Dict[str, float] = {}
+    
+    for results in result_lists:
+        for rank, result in enumerate(results):
+            doc_id = result.get("id") or result["content"]
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+            merged = fused.setdefault(doc_id, {})
+            for key, value in result.items():
+                merged.setdefault(key, value)
+    
+    ranked = sorted(scores, key=lambda doc_id: -scores[doc_id])[:n_results]
+    return [dict(fused[doc_id], rrf_score=round(scores[doc_id], 6)) for doc_id in ranked]
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import EMBEDDING_MODEL, LORE_ARTIFACT_PATH, get_embeddings
+from src.rag.lore_data import get_all_lore_documents
+from src.rag.query_cache import template_queries
+
+
+ARTIFACT_VERSION = 1
+
+
+def hash_document(doc: Dict) -> str:
+    payload = json.dumps({"content": doc["content"], "metadata": doc["metadata"]}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_artifact(path: Path = LORE_ARTIFACT_PATH) -> Optional[Dict]:
+    if not Path(path).exists():
+        return None
+    
+    try:
+        with open(path, "r") as f:
+            artifact = json.load(f)
+    except Exception as e:
+        print(f"Error reading lore artifact {path}: {e}")
+        return None
+    
+    if artifact.get("version") != ARTIFACT_VERSION or artifact.get("embedding_model") != EMBEDDING_MODEL:
+        return None
+    
+    return artifact
+
+
+def write_artifact(artifact: Dict, path: Path = LORE_ARTIFACT_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(artifact, f)
+    os.replace(tmp_path, path)
+
+
+def build_lore_artifact(
+    embeddings=None,
+    documents: Optional[List[Dict]] = None,
+    path: Path = LORE_ARTIFACT_PATH,
+    verbose: bool = True,
+    queries: Optional[List[str]] = None
+) -> Dict:
+    documents = documents if documents is not None else get_all_lore_documents()
+    queries = queries if queries is not None else template_queries()
+    previous = load_artifact(path) or {"documents": {}}
+    previous_queries = previous.get("queries", {})
+    
+    entries = {}
+    stale = []
+    for doc in documents:
+        doc_hash = hash_document(doc)
+        cached = previous["documents"].get(doc["id"])
+        
+        if cached is not None and cached["hash"] == doc_hash:
+            entries[doc["id"]] = cached
+        else:
+            stale.append((doc, doc_hash))
+    
+    removed = set(previous["documents"]) - {doc["id"] for doc in documents}
+    
+    query_entries = {query: previous_queries[query] for query in queries if query in previous_queries}
+    stale_queries = [query for query in queries if query not in query_entries]
+    removed_queries = set(previous_queries) - set(queries)
+    
+    if stale:
+        if verbose:
+            print(f"Embedding {len(stale)} new or changed lore documents...")
+        embeddings = embeddings or get_embeddings()
+        vectors = embeddings.embed_documents([doc["content"] for doc, _ in stale])
+        
+        for (doc, doc_hash), vector in zip(stale, vectors):
+            entries[doc["id"]] = {
+                "hash": doc_hash,
+                "content": doc["content"],
+                "metadata": doc["metadata"],
+                "embedding": list(vector)
+            }
+    
+    if stale_queries:
+        if verbose:
+            print(f"Embedding {len(stale_queries)} templated retrieval queries...")
+        embeddings = embeddings or get_embeddings()
+        vectors = embeddings.embed_documents(stale_queries)
+        
+        for query, vector in zip(stale_queries, vectors):
+            query_entries[query] = list(vector)
+    
+    changed = bool(stale or removed or stale_queries or removed_queries)
+    
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "embedding_model": EMBEDDING_MODEL,
+        "built_at": previous.get("built_at") if not changed else datetime.now().isoformat(),
+        "documents": entries,
+        "queries": query_entries
+    }
+    
+    if changed or not Path(path).exists():
+        write_artifact(artifact, path)
+        if verbose:
+            print(f"Lore artifact written to {path} ({len(entries)} documents, {len(removed)} removed, "
+                  f"{len(query_entries)} precomputed queries).")
+    
+    return artifact
+
+
+def main():
+    build_lore_artifact(verbose=True)
+    
+    if "--sync" in sys.argv:
+        from src.rag.vector_store import get_vector_store
+        get_vector_store().initialize_lore(verbose=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional
+
+from src.config import QUERY_EMBEDDING_CACHE_SIZE
+from src.world_data import WorldData, get_world_data
+
+
+LOCATION_QUERY = "information about {location} location setting description"
+NPC_QUERY = "information about {npc_name} backstory personality"
+ITEM_QUERY = "information about {item} history properties"
+
+
+def _names(entries: Mapping) -> List[str]:
+    names = []
+    for key, entry in entries.items():
+        names.append(key)
+        names.append(key.replace("_", " "))
+        if isinstance(entry, Mapping) and entry.get("name"):
+            names.append(entry["name"])
+    return names
+
+
+def template_queries(world: Optional[WorldData] = None) -> List[str]:
+    world = world or get_world_data()
+    exemplars = world.files.get("route_exemplars", {})
+    
+    queries = []
+    queries += [LOCATION_QUERY.format(location=name) for name in _names(world.locations)]
+    queries += [NPC_QUERY.format(npc_name=name) for name in _names(world.npcs)]
+    queries += [ITEM_QUERY.format(item=name) for name in _names(world.items)]
+    queries += [text for texts in exemplars.values() for text in texts]
+    return list(dict.fromkeys(queries))
+
+
+class QueryEmbeddingCache:
+    
+    def __init__(self, max_entries: int = QUERY_EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._precomputed: Dict[str, List[float]] = {}
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counts = {"precomputed": 0, "hit": 0, "miss": 0}
+    
+    def load_precomputed(self, queries: Dict[str, List[float]]):
+        with self._lock:
+            self._precomputed = dict(queries)
+    
+    def embed(self, queries: List[str], embed_fn: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        vectors: List[Optional[List[float]]] = [None] * len(queries)
+        missing: Dict[str, List[int]] = {}
+        
+        with self._lock:
+            for i, query in enumerate(queries):
+                if query in self._precomputed:
+                    vectors[i] = self._precomputed[query]
+                    self.counts["precomputed"] += 1
+                elif query in self._entries:
+                    self._entries.move_to_end(query)
+                    vectors[i] = self._entries[query]
+                    self.counts["hit"] += 1
+                else:
+                    missing.setdefault(query, []).append(i)
+                    self.counts["miss"] += 1
+        
+        if missing:
+            embedded = embed_fn(list(missing))
+            
+            with self._lock:
+                for query, vector in zip(missing, embedded):
+                    vector = list(vector)
+                    for i in missing[query]:
+                        vectors[i] = vector
+                    self._entries[query] = vector
+                    self._entries.move_to_end(query)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        
+        return vectors
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = sum(self.counts.values())
+            return {
+                "precomputed_queries": len(self._precomputed),
+                "cached_queries": len(self._entries),
+                "max_entries": self.max_entries,
+                **self.counts,
+                "hit_rate": round((lookups - self.counts["miss"]) / lookups, 3) if lookups else 0.0
+            }
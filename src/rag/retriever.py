@@ -1,72 +1,158 @@
-
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+from src.rag.context_packer import pack_context
+from src.rag.query_cache import LOCATION_QUERY, NPC_QUERY, ITEM_QUERY
 from src.rag.vector_store import get_vector_store
 
 
+MAX_PREFETCHED = 32
+
+
+class RetrievalSpec:
+    
+    def __init__(self, query: str, tags: Optional[List[str]] = None, k: int = 2):
+        self.query = query
+        self.tags = list(tags) if tags else None
+        self.k = k
+    
+    @property
+    def key(self) -> Tuple:
+        return (self.query.strip().lower(), tuple(self.tags or ()), self.k)
+    
+    @classmethod
+    def location(cls, location: str, k: int = 2) -> "RetrievalSpec":
+        return cls(LOCATION_QUERY.format(location=location), ["location"], k)
+    
+    @classmethod
+    def npc(cls, npc_name: str, k: int = 2) -> "RetrievalSpec":
+        return cls(NPC_QUERY.format(npc_name=npc_name), ["npc"], k)
+    
+    @classmethod
+    def item(cls, item: str, k: int = 1) -> "RetrievalSpec":
+        return cls(ITEM_QUERY.format(item=item), ["item"], k)
+    
+    @classmethod
+    def action(cls, action: str, location: str, k: int = 3) -> "RetrievalSpec":
+        return cls(f"{action} at {location}", None, k)
+    
+    @classmethod
+    def world(cls, topic: str, k: int = 2) -> "RetrievalSpec":
+        return cls(topic, ["history", "world_lore"], k)
+
+
 class LoreRetriever:
     
     def __init__(self):
         self.vector_store = get_vector_store()
+        self._prefetched: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
     
-    def get_location_context(self, location: str, n_results: int = 2) -> List[str]:
-        query = f"information about {location} location setting description"
-        results = self.vector_store.search(
-            query=query,
-            n_results=n_results,
-            filter_tags=["location"]
-        )
+    def _plan(self, specs: List[RetrievalSpec]):
+        found: Dict[int, List[Dict]] = {}
+        pending: List[int] = []
+        
+        for i, spec in enumerate(specs):
+            prefetched = self._prefetched.pop(spec.key, None)
+            if prefetched is not None:
+                found[i] = prefetched
+            else:
+                pending.append(i)
         
-        return [result["content"] for result in results]
+        return found, pending
     
-    def get_npc_context(self, npc_name: str, n_results: int = 2) -> List[str]:
-        query = f"information about {npc_name} backstory personality"
-        results = self.vector_store.search(
-            query=query,
-            n_results=n_results,
-            filter_tags=["npc"]
-        )
+    @staticmethod
+    def _fetch_sizes(specs: List[RetrievalSpec], pending: List[int]) -> List[int]:
+        return [sum(spec.k for spec in specs[:i + 1]) for i in pending]
+    
+    @staticmethod
+    def _dedupe(specs: List[RetrievalSpec], found: Dict[int, List[Dict]]) -> List[List[Dict]]:
+        seen = set()
+        grouped = []
         
-        return [result["content"] for result in results]
+        for i, spec in enumerate(specs):
+            unique = []
+            for result in found.get(i, []):
+                doc_id = result.get("id") or result["content"]
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                unique.append(result)
+                if len(unique) >= spec.k:
+                    break
+            grouped.append(unique)
+        
+        return grouped
     
-    def get_item_context(self, item: str, n_results: int = 1) -> List[str]:
-        query = f"information about {item} history properties"
-        results = self.vector_store.search(
-            query=query,
-            n_results=n_results,
-            filter_tags=["item"]
-        )
+    def search_batch(self, specs: List[RetrievalSpec]) -> List[List[Dict]]:
+        found, pending = self._plan(specs)
+        
+        if pending:
+            results = self.vector_store.search_batch(
+                queries=[specs[i].query for i in pending],
+                n_results=self._fetch_sizes(specs, pending),
+                filter_tags=[specs[i].tags for i in pending]
+            )
+            found.update(zip(pending, results))
         
-        return [result["content"] for result in results]
+        return self._dedupe(specs, found)
     
-    def get_action_context(self, action: str, location: str, n_results: int = 3) -> List[str]:
-        query = f"{action} at {location}"
-        results = self.vector_store.search(
-            query=query,
-            n_results=n_results
-        )
+    async def asearch_batch(self, specs: List[RetrievalSpec]) -> List[List[Dict]]:
+        found, pending = self._plan(specs)
+        
+        if pending:
+            results = await self.vector_store.asearch_batch(
+                queries=[specs[i].query for i in pending],
+                n_results=self._fetch_sizes(specs, pending),
+                filter_tags=[specs[i].tags for i in pending]
+            )
+            found.update(zip(pending, results))
         
-        return [result["content"] for result in results]
+        return self._dedupe(specs, found)
+    
+    def retrieve_batch(self, specs: List[RetrievalSpec]) -> List[List[str]]:
+        return [[result["content"] for result in group] for group in self.search_batch(specs)]
+    
+    def get_location_context(self, location: str, n_results: int = 2) -> List[str]:
+        return self.retrieve_batch([RetrievalSpec.location(location, n_results)])[0]
+    
+    def get_npc_context(self, npc_name: str, n_results: int = 2) -> List[str]:
+        return self.retrieve_batch([RetrievalSpec.npc(npc_name, n_results)])[0]
+    
+    def get_item_context(self, item: str, n_results: int = 1) -> List[str]:
+        return self.retrieve_batch([RetrievalSpec.item(item, n_results)])[0]
+    
+    def get_action_context(self, action: str, location: str, n_results: int = 3) -> List[str]:
+        return self.retrieve_batch([RetrievalSpec.action(action, location, n_results)])[0]
     
     def get_world_context(self, topic: str, n_results: int = 2) -> List[str]:
-        results = self.vector_store.search(
-            query=topic,
-            n_results=n_results,
-            filter_tags=["history", "world_lore"]
+        return self.retrieve_batch([RetrievalSpec.world(topic, n_results)])[0]
+    
+    async def aprefetch(self, specs: List[RetrievalSpec]):
+        pending = [i for i, spec in enumerate(specs) if spec.key not in self._prefetched]
+        if not pending:
+            return
+        
+        results = await self.vector_store.asearch_batch(
+            queries=[specs[i].query for i in pending],
+            n_results=self._fetch_sizes(specs, pending),
+            filter_tags=[specs[i].tags for i in pending]
         )
         
-        return [result["content"] for result in results]
+        for i, result in zip(pending, results):
+            self._prefetched[specs[i].key] = result
+        while len(self._prefetched) > MAX_PREFETCHED:
+            self._prefetched.popitem(last=False)
     
-    def format_context_for_prompt(self, context_pieces: List[str], max_length: int = 500) -> str:
-        if not context_pieces:
+    def format_context_for_prompt(
+        self,
+        context_pieces: List,
+        node: str = "default",
+        token_budget: Optional[int] = None
+    ) -> str:
+        packed = pack_context(context_pieces, node=node, token_budget=token_budget)
+        if not packed:
             return "No specific lore available."
         
-        combined = "\n\n".join(context_pieces)
-        
-        if len(combined) > max_length:
-            combined = combined[:max_length] + "..."
-        
-        return combined
-
+        return "\n\n".join(packed)
 
 _retriever_instance = None
 
@@ -1,59 +1,107 @@
 
-import chromadb
-from chromadb.config import Settings
+import asyncio
 from typing import List, Dict, Optional
 import os
 
-from src.config import VECTOR_STORE_PATH, get_embeddings
-from src.rag.lore_data import get_all_lore_documents
+from src.config import (
+    VECTOR_STORE_PATH,
+    VECTOR_BACKEND,
+    NUMPY_INDEX_PATH,
+    VECTOR_QUANTIZATION,
+    VECTOR_RESCORE_FACTOR,
+    RETRIEVAL_MODE,
+    KEYWORD_STRONG_SCORE,
+    KEYWORD_STRONG_MARGIN,
+    RRF_K,
+    get_embeddings
+)
+from src.rag.backends import create_backend
+from src.rag.ingest import INGEST_ID_PREFIX
+from src.rag.keyword_index import BM25Index, is_strong_hit, reciprocal_rank_fusion
+from src.rag.lore_build import build_lore_artifact
+from src.rag.query_cache import QueryEmbeddingCache
+from src.utils.metrics import get_metrics
 
 
 class LoreVectorStore:
     
-    def __init__(self, persist_directory: Optional[str] = None):
-        self.persist_directory = persist_directory or str(VECTOR_STORE_PATH)
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        backend: Optional[str] = None,
+        retrieval_mode: Optional[str] = None,
+        quantization: Optional[str] = None,
+        embeddings=None
+    ):
+        self.backend_name = backend or VECTOR_BACKEND
+        self.retrieval_mode = retrieval_mode or RETRIEVAL_MODE
         
-        self.client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        if persist_directory is None:
+            persist_directory = str(NUMPY_INDEX_PATH if self.backend_name == "numpy" else VECTOR_STORE_PATH)
+        self.persist_directory = persist_directory
         
-        self.collection = self.client.get_or_create_collection(
-            name="game_lore",
-            metadata={"description": "Medieval fantasy RPG world lore"}
+        self.backend = create_backend(
+            self.backend_name,
+            self.persist_directory,
+            quantization=quantization or VECTOR_QUANTIZATION,
+            rescore_factor=VECTOR_RESCORE_FACTOR
         )
-        
-        self.embeddings = get_embeddings()
+        self.embeddings = embeddings or get_embeddings()
+        self.query_cache = QueryEmbeddingCache()
+        self.keyword_index = BM25Index()
     
-    def initialize_lore(self, force_reload: bool = False):
-        if self.collection.count() > 0 and not force_reload:
-            print(f"Vector store already contains {self.collection.count()} documents.")
-            return
-        
+    def initialize_lore(self, force_reload: bool = False, verbose: bool = True, artifact: Optional[Dict] = None):
         if force_reload:
-            self.client.delete_collection("game_lore")
-            self.collection = self.client.create_collection(
-                name="game_lore",
-                metadata={"description": "Medieval fantasy RPG world lore"}
-            )
+            self.backend.reset()
         
-        documents = get_all_lore_documents()
+        if artifact is None:
+            artifact = build_lore_artifact(self.embeddings, verbose=verbose)
+        added, changed, removed = self.sync_with_artifact(artifact)
+        self.query_cache.load_precomputed(artifact.get("queries", {}))
+        self.keyword_index = BM25Index.from_artifact(artifact)
         
-        ids = [doc["id"] for doc in documents]
-        contents = [doc["content"] for doc in documents]
-        metadatas = [doc["metadata"] for doc in documents]
+        if verbose:
+            if added or changed or removed:
+                print(f"Lore index updated: {added} added, {changed} changed, {removed} removed "
+                      f"({self.backend.count()} documents).")
+            else:
+                print(f"Vector store already contains {self.backend.count()} documents.")
+    
+    def sync_with_artifact(self, artifact: Dict):
+        stored_hashes = self.backend.get_hashes()
         
-        print(f"Adding {len(documents)} lore documents to vector store...")
-        embeddings_list = self.embeddings.embed_documents(contents)
+        documents = artifact["documents"]
+        changed = [doc_id for doc_id, entry in documents.items() if stored_hashes.get(doc_id) != entry["hash"]]
+        removed = [
+            doc_id for doc_id in stored_hashes
+            if doc_id not in documents and not doc_id.startswith(INGEST_ID_PREFIX)
+        ]
         
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings_list,
-            documents=contents,
-            metadatas=metadatas
-        )
+        if changed:
+            self.backend.upsert(
+                ids=changed,
+                embeddings=[documents[doc_id]["embedding"] for doc_id in changed],
+                documents=[documents[doc_id]["content"] for doc_id in changed],
+                metadatas=[
+                    dict(documents[doc_id]["metadata"], content_hash=documents[doc_id]["hash"])
+                    for doc_id in changed
+                ]
+            )
         
-        print(f"Successfully initialized vector store with {self.collection.count()} documents.")
+        if removed:
+            self.backend.delete(removed)
+        
+        if changed or removed:
+            self.backend.persist()
+        
+        added = sum(1 for doc_id in changed if doc_id not in stored_hashes)
+        return added, len(changed) - added, len(removed)
+    
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        return self.query_cache.embed(queries, self.embeddings.embed_documents)
+    
+    def embed_query(self, query: str) -> List[float]:
+        return self.embed_queries([query])[0]
     
     def search(
         self,
@@ -61,44 +109,70 @@ class LoreVectorStore:
         n_results: int = 3,
         filter_tags: Optional[List[str]] = None
     ) -> List[Dict]:
-        query_embedding = self.embeddings.embed_query(query)
+        return self.search_batch([query], [n_results], [filter_tags])[0]
+    
+    async def asearch(
+        self,
+        query: str,
+        n_results: int = 3,
+        filter_tags: Optional[List[str]] = None
+    ) -> List[Dict]:
+        return await asyncio.to_thread(self.search, query, n_results, filter_tags)
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        n_results: List[int],
+        filter_tags: List[Optional[List[str]]]
+    ) -> List[List[Dict]]:
+        if not queries:
+            return []
         
-        where_filter = None
-        if filter_tags:
-            where_filter = {"tags": {"$in": filter_tags}}
+        metrics = get_metrics()
         
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            where=where_filter if where_filter else None
-        )
+        if self.retrieval_mode == "dense" or not len(self.keyword_index):
+            metrics.increment("retrieval.dense", len(queries))
+            return self.backend.query_batch(self.embed_queries(queries), n_results, filter_tags)
         
-        formatted_results = []
-        if results['documents'] and len(results['documents']) > 0:
-            for i in range(len(results['documents'][0])):
-                formatted_results.append({
-                    "content": results['documents'][0][i],
-                    "metadata": results['metadatas'][0][i],
-                    "distance": results['distances'][0][i] if 'distances' in results else None
-                })
+        results: List[Optional[List[Dict]]] = [None] * len(queries)
+        keyword_results = []
+        pending = []
+        fast_path = self.backend.count() <= len(self.keyword_index)
         
-        return formatted_results
-    
-    def get_by_category(self, category: str, n_results: int = 5) -> List[Dict]:
-        results = self.collection.get(
-            where={"category": category},
-            limit=n_results
-        )
+        for i, (query, n, tags) in enumerate(zip(queries, n_results, filter_tags)):
+            hits = self.keyword_index.search(query, max(n * 2, 2), tags)
+            keyword_results.append(hits)
+            
+            if self.retrieval_mode == "keyword" or (
+                fast_path and is_strong_hit(hits, KEYWORD_STRONG_SCORE, KEYWORD_STRONG_MARGIN)
+            ):
+                results[i] = hits[:n]
+                metrics.increment("retrieval.keyword_only")
+            else:
+                pending.append(i)
         
-        formatted_results = []
-        if results['documents']:
-            for i in range(len(results['documents'])):
-                formatted_results.append({
-                    "content": results['documents'][i],
-                    "metadata": results['metadatas'][i]
-                })
+        if pending:
+            dense_results = self.backend.query_batch(
+                self.embed_queries([queries[i] for i in pending]),
+                [n_results[i] * 2 for i in pending],
+                [filter_tags[i] for i in pending]
+            )
+            for i, dense in zip(pending, dense_results):
+                results[i] = reciprocal_rank_fusion([dense, keyword_results[i]], n_results[i], RRF_K)
+            metrics.increment("retrieval.hybrid", len(pending))
         
-        return formatted_results
+        return results
+    
+    async def asearch_batch(
+        self,
+        queries: List[str],
+        n_results: List[int],
+        filter_tags: List[Optional[List[str]]]
+    ) -> List[List[Dict]]:
+        return await asyncio.to_thread(self.search_batch, queries, n_results, filter_tags)
+    
+    def get_by_category(self, category: str, n_results: int = 5) -> List[Dict]:
+        return self.backend.get_by_category(category, n_results)
 
 
 _vector_store_instance = None
@@ -0,0 +1,34 @@
+import asyncio
+import threading
+from typing import Optional
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    if _background_loop is None:
+        with _background_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="game-event-loop", daemon=True)
+                thread.start()
+                _background_loop = loop
+    return _background_loop
+
+
+def run_sync(coro):
+    loop = get_background_loop()
+    
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the game event loop; await the coroutine instead")
+    
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
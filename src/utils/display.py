@@ -14,6 +14,14 @@ def print_narrative(text: str):
     print(f"{Fore.GREEN}{text}{Style.RESET_ALL}\n")
 
 
+def print_stream_token(text: str):
+    print(f"{Fore.GREEN}{text}{Style.RESET_ALL}", end="", flush=True)
+
+
+def end_stream():
+    print("\n")
+
+
 def print_dialogue(speaker: str, text: str):
     print(f"{Fore.YELLOW}{Style.BRIGHT}{speaker}:{Style.RESET_ALL} {Fore.YELLOW}\"{text}\"{Style.RESET_ALL}\n")
 
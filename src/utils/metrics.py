@@ -0,0 +1,227 @@
+import asyncio
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.config import (
+    DEBUG_MODE,
+    METRICS_EXPORT_PATH,
+    METRICS_MAX_SAMPLES,
+    LLM_COST_PER_1K_PROMPT,
+    LLM_COST_PER_1K_COMPLETION
+)
+
+
+_current_turn: contextvars.ContextVar = contextvars.ContextVar("current_turn", default=None)
+_suppressed: contextvars.ContextVar = contextvars.ContextVar("metrics_suppressed", default=False)
+
+
+def suppress_metrics():
+    _suppressed.set(True)
+
+
+class Histogram:
+    
+    def __init__(self, max_samples: int = METRICS_MAX_SAMPLES):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+    
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+    
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+
+class MetricsRegistry:
+    
+    def __init__(self, export_path: Optional[str] = METRICS_EXPORT_PATH):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.turns = deque(maxlen=METRICS_MAX_SAMPLES)
+        self.export_path = export_path
+        self._lock = threading.Lock()
+    
+    def observe(self, name: str, value: float):
+        if _suppressed.get():
+            return
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(value)
+    
+    def increment(self, name: str, amount: float = 1):
+        if _suppressed.get():
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def start_turn(self, action: str) -> Dict:
+        turn = {
+            "timestamp": datetime.now().isoformat(),
+            "action": action,
+            "nodes": {},
+            "retrieval_ms": 0.0,
+            "llm": [],
+            "cache": {}
+        }
+        turn["_token"] = _current_turn.set(turn)
+        turn["_start"] = time.perf_counter()
+        return turn
+    
+    def finish_turn(self, turn: Dict) -> Dict:
+        wall_ms = (time.perf_counter() - turn.pop("_start")) * 1000
+        _current_turn.reset(turn.pop("_token"))
+        
+        turn["wall_ms"] = round(wall_ms, 2)
+        turn["prompt_tokens"] = sum(call["prompt_tokens"] for call in turn["llm"])
+        turn["completion_tokens"] = sum(call["completion_tokens"] for call in turn["llm"])
+        turn["cost"] = round(sum(call["cost"] for call in turn["llm"]), 6)
+        
+        self.observe("turn.wall_ms", wall_ms)
+        self.increment("turns")
+        with self._lock:
+            self.turns.append(turn)
+        
+        if self.export_path:
+            self._append_jsonl(self.export_path, [turn])
+        
+        return turn
+    
+    def current_turn(self) -> Optional[Dict]:
+        if _suppressed.get():
+            return None
+        return _current_turn.get()
+    
+    def record_node(self, node: str, wall_ms: float):
+        self.observe(f"node.{node}.wall_ms", wall_ms)
+        turn = self.current_turn()
+        if turn is not None:
+            turn["nodes"][node] = round(turn["nodes"].get(node, 0.0) + wall_ms, 2)
+    
+    def record_retrieval(self, node: str, wall_ms: float):
+        self.observe(f"retrieval.{node}.ms", wall_ms)
+        turn = self.current_turn()
+        if turn is not None:
+            turn["retrieval_ms"] = round(turn["retrieval_ms"] + wall_ms, 2)
+    
+    def record_llm(self, node: str, model: str, prompt_tokens: int, completion_tokens: int, wall_ms: float):
+        cost = (
+            prompt_tokens / 1000.0 * LLM_COST_PER_1K_PROMPT
+            + completion_tokens / 1000.0 * LLM_COST_PER_1K_COMPLETION
+        )
+        
+        self.observe(f"llm.{node}.ms", wall_ms)
+        self.observe("llm.prompt_tokens", prompt_tokens)
+        self.observe("llm.completion_tokens", completion_tokens)
+        self.increment(f"llm.calls.{model}")
+        self.increment("llm.cost", cost)
+        
+        turn = self.current_turn()
+        if turn is not None:
+            turn["llm"].append({
+                "node": node,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "wall_ms": round(wall_ms, 2),
+                "cost": cost
+            })
+    
+    def record_cache(self, name: str, hit: bool):
+        self.increment(f"cache.{name}.{'hit' if hit else 'miss'}")
+        turn = self.current_turn()
+        if turn is not None:
+            turn["cache"][name] = hit
+    
+    @contextmanager
+    def timer(self, kind: str, node: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            if kind == "retrieval":
+                self.record_retrieval(node, wall_ms)
+            else:
+                self.observe(f"{kind}.{node}.ms", wall_ms)
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "histograms": {name: hist.summary() for name, hist in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items()))
+            }
+    
+    def _append_jsonl(self, path: str, records: List[Dict]):
+        try:
+            with open(path, "a") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"Error exporting metrics: {e}")
+    
+    def export_jsonl(self, path: str) -> int:
+        with self._lock:
+            records = list(self.turns)
+        self._append_jsonl(path, records)
+        return len(records)
+
+
+def timed_node(name: str, func):
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state):
+            start = time.perf_counter()
+            try:
+                return await func(state)
+            finally:
+                wall_ms = (time.perf_counter() - start) * 1000
+                get_metrics().record_node(name, wall_ms)
+                if DEBUG_MODE:
+                    print(f"[Node: {name}] {wall_ms:.1f}ms")
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(state):
+        start = time.perf_counter()
+        try:
+            return func(state)
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            get_metrics().record_node(name, wall_ms)
+            if DEBUG_MODE:
+                print(f"[Node: {name}] {wall_ms:.1f}ms")
+    return wrapper
+
+
+_metrics_instance: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = MetricsRegistry()
+    return _metrics_instance
@@ -0,0 +1,81 @@
+import re
+from typing import Optional
+
+
+ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t"
+}
+
+
+class JsonFieldStreamer:
+    
+    def __init__(self, field: str):
+        self.field = field
+        self.key_pattern = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self.buffer = ""
+        self.pos = 0
+        self.mode: Optional[str] = None
+        self.done = False
+    
+    def feed(self, chunk: str) -> str:
+        if not chunk or self.done:
+            return ""
+        
+        self.buffer += chunk
+        
+        if self.mode is None:
+            stripped = self.buffer.lstrip()
+            if not stripped:
+                return ""
+            self.mode = "json" if stripped[0] in "{`" else "raw"
+        
+        if self.mode == "raw":
+            return chunk
+        
+        if self.mode == "json":
+            match = self.key_pattern.search(self.buffer, self.pos)
+            if not match:
+                return ""
+            self.mode = "field"
+            self.pos = match.end()
+        
+        return self._read_field()
+    
+    def _read_field(self) -> str:
+        out = []
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+            
+            if char == '"':
+                self.done = True
+                break
+            
+            if char == "\\":
+                if self.pos + 1 >= len(self.buffer):
+                    break
+                code = self.buffer[self.pos + 1]
+                if code == "u":
+                    if self.pos + 6 > len(self.buffer):
+                        break
+                    try:
+                        out.append(chr(int(self.buffer[self.pos + 2:self.pos + 6], 16)))
+                    except ValueError:
+                        pass
+                    self.pos += 6
+                    continue
+                out.append(ESCAPES.get(code, code))
+                self.pos += 2
+                continue
+            
+            out.append(char)
+            self.pos += 1
+        
+        return "".join(out)
+
@@ -0,0 +1,110 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+HEAVY_MODULES = [
+    "langchain_core.messages",
+    "langgraph.graph",
+    "chromadb",
+    "src.graph.graph"
+]
+
+
+class StartupProfiler:
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.entries: List[Tuple[str, float, str]] = []
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def measure(self, label: str, thread: Optional[str] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.entries.append((label, elapsed_ms, thread or threading.current_thread().name))
+    
+    def mark(self, label: str):
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        with self._lock:
+            self.entries.append((label, elapsed_ms, "since start"))
+    
+    def report(self) -> str:
+        with self._lock:
+            entries = list(self.entries)
+        
+        lines = [f"  {'step':<44} {'ms':>10}  thread"]
+        for label, elapsed_ms, thread in entries:
+            lines.append(f"  {label:<44} {elapsed_ms:>10.1f}  {thread}")
+        return "\n".join(lines)
+
+
+class BackgroundWarmup:
+    
+    def __init__(self, engine, profiler: StartupProfiler):
+        self.engine = engine
+        self.profiler = profiler
+        self.ready = threading.Event()
+        self.errors: List[str] = []
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+            self._thread.start()
+    
+    def _step(self, label: str, func):
+        try:
+            with self.profiler.measure(label):
+                func()
+        except Exception as e:
+            self.errors.append(f"{label}: {e}")
+    
+    def _run(self):
+        try:
+            from src.config import VECTOR_BACKEND
+            
+            for name in HEAVY_MODULES:
+                if name == "chromadb" and VECTOR_BACKEND != "chroma":
+                    continue
+                self._step(f"import {name}", lambda name=name: importlib.import_module(name))
+            
+            self._step("compile game graph", lambda: self.engine.graph)
+            self._step("load embedding model + vector store", lambda: self.engine.vector_store)
+            self._step("initialize lore", lambda: self.engine.vector_store.initialize_lore(force_reload=False, verbose=False))
+            self._step("warm embedding model", lambda: self.engine.vector_store.embeddings.embed_query("warmup"))
+            self._step("embed route exemplars", self._warm_router)
+            self._step("create LLM client", self._warm_llm)
+        finally:
+            self.profiler.mark("warmup complete")
+            self.ready.set()
+    
+    def _warm_router(self):
+        from src.config import SEMANTIC_ROUTER_ENABLED
+        from src.graph.semantic_router import get_semantic_router
+        
+        if SEMANTIC_ROUTER_ENABLED:
+            get_semantic_router().prepare()
+    
+    def _warm_llm(self):
+        from src.config import get_llm
+        get_llm()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.ready.wait(timeout)
+
+
+_profiler_instance: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    global _profiler_instance
+    if _profiler_instance is None:
+        _profiler_instance = StartupProfiler()
+    return _profiler_instance
@@ -0,0 +1,172 @@
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from src.config import PROJECT_ROOT, WORLD_DATA_HOT_RELOAD, WORLD_DATA_RELOAD_INTERVAL
+
+
+EMPTY = MappingProxyType({})
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    return tuple(TOKEN_PATTERN.findall(text.lower()))
+
+
+def scan_mtimes(data_dir: Path) -> Dict[str, float]:
+    try:
+        return {path.name: path.stat().st_mtime for path in data_dir.glob("*.json")}
+    except OSError:
+        return {}
+
+
+class NPCIndex:
+    
+    def __init__(self, npcs: Mapping[str, Mapping]):
+        self.order = {key: i for i, key in enumerate(npcs)}
+        self.location_of = {key: npc.get("location") for key, npc in npcs.items()}
+        
+        names: Dict[Tuple[str, ...], List[str]] = {}
+        aliases: Dict[Tuple[str, ...], List[str]] = {}
+        occupants: Dict[str, List[str]] = {}
+        
+        for key, npc in npcs.items():
+            name = tokenize(npc.get("name", ""))
+            phrases = {tokenize(key.replace("_", " ")), name}
+            phrases.update((word,) for word in name if len(word) > 3)
+            for phrase in phrases:
+                if phrase:
+                    names.setdefault(phrase, []).append(key)
+            
+            for alias in npc.get("aliases", ()):
+                if tokenize(alias):
+                    aliases.setdefault(tokenize(alias), []).append(key)
+            
+            if npc.get("location"):
+                occupants.setdefault(npc["location"], []).append(key)
+        
+        self.names = MappingProxyType({phrase: tuple(keys) for phrase, keys in names.items()})
+        self.aliases = MappingProxyType({phrase: tuple(keys) for phrase, keys in aliases.items()})
+        self.occupants = MappingProxyType({location: tuple(keys) for location, keys in occupants.items()})
+        self.max_phrase = max((len(phrase) for phrase in list(names) + list(aliases)), default=0)
+    
+    def at(self, location: Optional[str]) -> Tuple[str, ...]:
+        return self.occupants.get(location, ())
+    
+    def candidates(self, text: str, location: Optional[str] = None) -> List[str]:
+        tokens = tokenize(text)
+        matches: Dict[str, Tuple[int, int]] = {}
+        
+        for start in range(len(tokens)):
+            for length in range(min(self.max_phrase, len(tokens) - start), 0, -1):
+                phrase = tokens[start:start + length]
+                keys = self.names.get(phrase, ()) + tuple(
+                    key for key in self.aliases.get(phrase, ()) if self.location_of[key] == location
+                )
+                for key in keys:
+                    if key not in matches or length > matches[key][0]:
+                        matches[key] = (length, start)
+        
+        return sorted(matches, key=lambda key: (
+            -matches[key][0],
+            self.location_of[key] != location,
+            matches[key][1],
+            self.order[key]
+        ))
+    
+    def resolve(self, text: str, location: Optional[str] = None) -> Optional[str]:
+        ranked = self.candidates(text, location)
+        if ranked:
+            return ranked[0]
+        
+        present = self.at(location)
+        return present[0] if len(present) == 1 else None
+
+
+class WorldData:
+    
+    def __init__(self, data_dir: Path = PROJECT_ROOT / "data"):
+        self.data_dir = Path(data_dir)
+        self.mtimes = scan_mtimes(self.data_dir)
+        
+        files = {}
+        for name in sorted(self.mtimes):
+            try:
+                with open(self.data_dir / name, "r") as f:
+                    files[Path(name).stem] = freeze(json.load(f))
+            except Exception as e:
+                print(f"Error loading world data {name}: {e}")
+        self.files: Mapping[str, Any] = MappingProxyType(files)
+        
+        self.locations: Mapping[str, Mapping] = files.get("locations", EMPTY)
+        self.npcs: Mapping[str, Mapping] = files.get("npcs", EMPTY)
+        self.items: Mapping[str, Mapping] = files.get("items", EMPTY).get("items", EMPTY)
+        self.quests: Mapping[str, Mapping] = files.get("quests", EMPTY).get("quests", EMPTY)
+        
+        self.npc_index = NPCIndex(self.npcs)
+        
+        names: Dict[str, Dict[str, str]] = {}
+        for kind, entries in (("location", self.locations), ("npc", self.npcs), ("item", self.items), ("quest", self.quests)):
+            index = names.setdefault(kind, {})
+            for key, entry in entries.items():
+                for name in (key, key.replace("_", " "), entry.get("name", ""), *entry.get("aliases", ())):
+                    if name:
+                        index.setdefault(name.lower(), key)
+        self.names: Mapping[str, Mapping[str, str]] = MappingProxyType(
+            {kind: MappingProxyType(index) for kind, index in names.items()}
+        )
+    
+    def resolve(self, kind: str, name: str) -> Optional[str]:
+        return self.names.get(kind, EMPTY).get(name.lower())
+    
+    def npc(self, name: str) -> Optional[Mapping]:
+        key = self.resolve("npc", name)
+        return self.npcs[key] if key else None
+    
+    def location(self, name: str) -> Optional[Mapping]:
+        key = self.resolve("location", name)
+        return self.locations[key] if key else None
+    
+    def item(self, name: str) -> Optional[Mapping]:
+        key = self.resolve("item", name)
+        return self.items[key] if key else None
+    
+    def npcs_at(self, location: str) -> Tuple[str, ...]:
+        return self.npc_index.at(location)
+    
+    def is_stale(self) -> bool:
+        return scan_mtimes(self.data_dir) != self.mtimes
+
+
+_world_instance: Optional[WorldData] = None
+_world_checked_at = 0.0
+_world_lock = threading.Lock()
+
+
+def get_world_data() -> WorldData:
+    global _world_instance, _world_checked_at
+    
+    world = _world_instance
+    if world is not None and not WORLD_DATA_HOT_RELOAD:
+        return world
+    if world is not None and time.monotonic() - _world_checked_at < WORLD_DATA_RELOAD_INTERVAL:
+        return world
+    
+    with _world_lock:
+        if _world_instance is None or _world_instance.is_stale():
+            _world_instance = WorldData()
+        _world_checked_at = time.monotonic()
+        return _world_instance
+
@@ -0,0 +1,33 @@
+from src.rag.ingest import chunk_text
+
+
+def words_of(chunks):
+    return {word for chunk in chunks for word in chunk.split()}
+
+
+def test_unbroken_text_is_fully_covered():
+    text = "x" * 450
+    chunks = list(chunk_text([text], 200, 50))
+    
+    assert "".join(chunk if i == 0 else chunk[50:] for i, chunk in enumerate(chunks)) == text
+
+
+def test_single_segment_keeps_every_word():
+    words = [f"w{i}" for i in range(60)]
+    chunks = list(chunk_text([" ".join(words)], 100, 20))
+    
+    assert words_of(chunks) == set(words)
+    assert chunks[-1].endswith("w59")
+
+
+def test_multi_segment_keeps_every_word():
+    words = [f"word{i}" for i in range(200)]
+    segments = [" ".join(words[i:i + 7]) + "\n" for i in range(0, len(words), 7)]
+    chunks = list(chunk_text(segments, 120, 30))
+    
+    assert words_of(chunks) == set(words)
+    assert chunks[-1].endswith("word199")
+
+
+def test_short_text_is_one_chunk():
+    assert list(chunk_text(["a short note"], 200, 50)) == ["a short note"]